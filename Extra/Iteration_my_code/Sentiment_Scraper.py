@@ -1,4 +1,5 @@
 import os
+import sys
 import csv
 from transformers import pipeline
 from selenium import webdriver
@@ -7,6 +8,11 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
+
+# The shared modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from review_classifier import classify_review  # Shared keyword categories
 import tkinter as tk
 from tkinter import messagebox
 
@@ -26,16 +32,6 @@ def analyze_sentiment_bert(text):
     return label, score
 
 
-# Function to classify reviews into "Ending" or "Journey" categories
-def classify_review(content):
-    if any(keyword in content.lower() for keyword in ["ending", "final", "conclusion", "last chapter", "wrap up", "cliffhanger"]):
-        return "Ending"
-    elif any(keyword in content.lower() for keyword in ["journey", "plot", "story", "characters", "development"]):
-        return "Journey"
-    else:
-        return "General"
-
-
 # Function to scrape Goodreads reviews using Selenium
 def scrape_goodreads(url, book_title):
     try:
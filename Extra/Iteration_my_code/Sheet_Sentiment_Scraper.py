@@ -1,6 +1,10 @@
 # Doesn't ask for user input just uses a CSV file
 import os
+import sys
 import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
 from transformers import pipeline
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -9,12 +13,26 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 
-# Load Hugging Face sentiment analysis model
-sentiment_analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+# The shared modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from review_classifier import classify_review  # Shared keyword categories
+
+# Hugging Face sentiment analysis model, loaded once per process on first use
+sentiment_analyzer = None
+
+# Browser owned by this process when running as a pool worker
+_worker_driver = None
+
+def get_sentiment_analyzer():
+    global sentiment_analyzer
+    if sentiment_analyzer is None:
+        sentiment_analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+    return sentiment_analyzer
 
 # Function to analyze sentiment using DistilBERT
 def analyze_sentiment_bert(text):
-    result = sentiment_analyzer(text[:512])[0]  # Truncate text to max token length (512)
+    result = get_sentiment_analyzer()(text[:512])[0]  # Truncate text to max token length (512)
     label = result['label']
     score = result['score']
 
@@ -23,100 +41,174 @@ def analyze_sentiment_bert(text):
         score = -score
     return label, score
 
-# Function to classify reviews into "Ending" or "Journey" categories
-def classify_review(content):
-    if any(keyword in content.lower() for keyword in ["ending", "final", "conclusion", "last chapter", "wrap up", "cliffhanger"]):
-        return "Ending"
-    elif any(keyword in content.lower() for keyword in ["journey", "plot", "story", "characters", "development"]):
-        return "Journey"
-    else:
-        return "General"
+# Function to start a headless Chrome browser
+def create_driver():
+    # Set up Selenium WebDriver with options
+    options = Options()
+    options.page_load_strategy = 'normal'  # Wait for full page load
+    options.add_argument("--headless")  # Enable headless mode (optional)
+    options.add_argument("--disable-gpu")  # Disable GPU rendering (optional)
+    options.add_argument("--no-sandbox")  # Useful for some Linux setups
 
-# Function to scrape Goodreads reviews using Selenium
-def scrape_goodreads(url, book_title):
-    try:
-        # Set up Selenium WebDriver with options
-        options = Options()
-        options.page_load_strategy = 'normal'  # Wait for full page load
-        options.add_argument("--headless")  # Enable headless mode (optional)
-        options.add_argument("--disable-gpu")  # Disable GPU rendering (optional)
-        options.add_argument("--no-sandbox")  # Useful for some Linux setups
+    service = Service(ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=options)
 
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+    # Set timeouts
+    driver.set_page_load_timeout(120)  # Allow more time for page load
+    return driver
 
-        # Set timeouts
-        driver.set_page_load_timeout(120)  # Allow more time for page load
+# Function to scrape and score one book, raising on failure
+def scrape_book_reviews(url, book_title, driver):
+    driver.get(url)
 
-        try:
-            driver.get(url)
-        except TimeoutException:
-            print(f"Error: The page for '{book_title}' took too long to load. Skipping.")
-            driver.quit()
-            return
+    # Parse the page source with BeautifulSoup
+    soup = BeautifulSoup(driver.page_source, 'html.parser')
 
-        # Parse the page source with BeautifulSoup
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        driver.quit()
+    # Extract reviews
+    reviews = soup.find_all('section', class_='ReviewText__content')
 
-        # Extract reviews
-        reviews = soup.find_all('section', class_='ReviewText__content')
+    if not reviews:
+        raise ValueError(f"No reviews found for '{book_title}'.")
 
-        if not reviews:
-            print(f"No reviews found for '{book_title}'.")
-            return
+    # Define the save folder
+    save_folder = './data/my_rawdata' # MEHHHHH
+    os.makedirs(save_folder, exist_ok=True)  # Create the folder if it doesn't exist
 
-        # Define the save folder
-        save_folder = './data/my_rawdata' # MEHHHHH
-        os.makedirs(save_folder, exist_ok=True)  # Create the folder if it doesn't exist
+    # Define the CSV file path with new naming convention
+    file_path = os.path.join(save_folder, f"{book_title}_reviews_sentiment.csv")
 
-        # Define the CSV file path with new naming convention
-        file_path = os.path.join(save_folder, f"{book_title}_reviews_sentiment.csv")
+    # Save reviews and sentiment to CSV
+    with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Review', 'Category', 'Sentiment', 'Confidence Score'])
 
-        # Save reviews and sentiment to CSV
-        with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Review', 'Category', 'Sentiment', 'Confidence Score'])
+        for review in reviews:
+            # Extract the actual text from the `TruncatedContent__text` div
+            content_div = review.find('div', class_='TruncatedContent__text')
+            content = content_div.text.strip() if content_div else "No content"
 
-            for review in reviews:
-                # Extract the actual text from the `TruncatedContent__text` div
-                content_div = review.find('div', class_='TruncatedContent__text')
-                content = content_div.text.strip() if content_div else "No content"
+            # Classify review
+            category = classify_review(content)
 
-                # Classify review
-                category = classify_review(content)
+            # Perform sentiment analysis
+            sentiment_label, confidence_score = analyze_sentiment_bert(content)
 
-                # Perform sentiment analysis
-                sentiment_label, confidence_score = analyze_sentiment_bert(content)
+            # Write to CSV
+            writer.writerow([content, category, sentiment_label, confidence_score])
 
-                # Write to CSV
-                writer.writerow([content, category, sentiment_label, confidence_score])
+    return file_path
+
+# Function to scrape Goodreads reviews using Selenium
+def scrape_goodreads(url, book_title):
+    try:
+        driver = create_driver()
+        try:
+            file_path = scrape_book_reviews(url, book_title, driver)
+        finally:
+            driver.quit()
 
         print(f"Reviews for '{book_title}' successfully saved to {file_path}")
+        return file_path
 
+    except TimeoutException:
+        print(f"Error: The page for '{book_title}' took too long to load. Skipping.")
+    except ValueError as e:
+        print(e)
     except Exception as e:
         print(f"Error scraping '{book_title}': {e}")
 
+# Function run once in each pool worker: give it its own browser and model
+def _init_worker():
+    global _worker_driver
+    _worker_driver = create_driver()
+    get_sentiment_analyzer()
+
+    # Quit the browser when the worker process shuts down
+    Finalize(None, _quit_worker_driver, exitpriority=10)
+
+def _quit_worker_driver():
+    global _worker_driver
+    if _worker_driver is not None:
+        _worker_driver.quit()
+        _worker_driver = None
+
+# Function run in a pool worker for each book; returns (file path, error message)
+def _scrape_book_in_worker(book_title, url):
+    global _worker_driver
+    try:
+        if _worker_driver is None:
+            _worker_driver = create_driver()
+        return scrape_book_reviews(url, book_title, _worker_driver), None
+    except Exception as e:
+        # Start a fresh browser for the next book in case this one is left in a bad state
+        _quit_worker_driver()
+        if isinstance(e, TimeoutException):
+            return None, "The page took too long to load."
+        return None, str(e) or type(e).__name__
+
+# Function to read (book title, url) pairs from the book list CSV
+def read_book_list(csv_file):
+    books = []
+    with open(csv_file, mode='r', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader)  # Skip header row
+        for row in reader:
+            if len(row) < 2:
+                print("Invalid row format. Skipping.")
+                continue
+            books.append((row[0], row[1]))
+    return books
+
 # Function to process books from CSV file
-def process_books_from_csv(csv_file):
+def process_books_from_csv(csv_file, workers=1):
+    """
+    Scrape and score every book listed in a CSV file of (title, url) rows.
+
+    With workers > 1 the books are spread across a pool of worker processes,
+    each holding its own browser and sentiment model.
+
+    Returns:
+        dict: Maps each book title to {'file': CSV path or None, 'error': message or None}.
+    """
+    results = {}
     try:
-        with open(csv_file, mode='r', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            next(reader)  # Skip header row
-            for row in reader:
-                if len(row) < 2:
-                    print("Invalid row format. Skipping.")
-                    continue
-
-                book_title, url = row[0], row[1]
-                print(f"Processing: {book_title}")
-                scrape_goodreads(url, book_title)
+        books = read_book_list(csv_file)
     except FileNotFoundError:
         print(f"Error: File '{csv_file}' not found.")
+        return results
     except Exception as e:
         print(f"An error occurred while processing the CSV file: {e}")
+        return results
+
+    if workers <= 1:
+        for book_title, url in books:
+            print(f"Processing: {book_title}")
+            file_path = scrape_goodreads(url, book_title)
+            results[book_title] = {'file': file_path, 'error': None if file_path else "Scrape failed"}
+        return results
+
+    # "spawn" gives each worker a clean interpreter, which PyTorch and Chrome both prefer to fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as executor:
+        futures = {executor.submit(_scrape_book_in_worker, book_title, url): book_title
+                   for book_title, url in books}
+        for future in as_completed(futures):
+            book_title = futures[future]
+            try:
+                file_path, error = future.result()
+            except Exception as e:
+                file_path, error = None, f"Worker failed: {e}"
+            results[book_title] = {'file': file_path, 'error': error}
+            if error:
+                print(f"Error scraping '{book_title}': {error}")
+            else:
+                print(f"Reviews for '{book_title}' successfully saved to {file_path}")
+
+    failed = sum(1 for result in results.values() if result['error'])
+    print(f"Finished {len(results)} books ({failed} failed).")
+    return results
 
 # Run the script
 if __name__ == "__main__":
     csv_file_path = "/Users/25rao/PycharmProjects/Project4_Books/Bad_Endings_Books.csv"  # Replace with your CSV file path
-    process_books_from_csv(csv_file_path)
\ No newline at end of file
+    process_books_from_csv(csv_file_path, workers=max(1, (os.cpu_count() or 2) // 2))
@@ -1,18 +1,23 @@
+import os
+import sys
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report
-import numpy as np
+
+# The shared modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from category_encoder import CategoryEncoder  # Shared with model_b
 
 # Load the dataset from a CSV file
 df = pd.read_csv('/all_books_scores.csv')
 
-# Initialize LabelEncoders
-label_encoder_author = LabelEncoder()
-label_encoder_genre = LabelEncoder()
+# Initialize encoders
+label_encoder_author = CategoryEncoder()
+label_encoder_genre = CategoryEncoder()
 
-# Fit LabelEncoders to the data
+# Fit encoders to the data
 df["Author"] = label_encoder_author.fit_transform(df["Author"])
 df["Genre"] = label_encoder_genre.fit_transform(df["Genre"])
 
@@ -43,20 +48,9 @@ print("Classification Report:\n", classification_report(y_test, predictions))
 new_author = "J.K. Rowling"
 new_genre = "Fantasy"
 
-# Handle new authors and genres
-if new_author not in label_encoder_author.classes_:
-    # Add "unknown" to the classes_
-    label_encoder_author.classes_ = np.append(label_encoder_author.classes_, "unknown")
-    author_encoded = label_encoder_author.transform(["unknown"])[0]
-else:
-    author_encoded = label_encoder_author.transform([new_author])[0]
-
-if new_genre not in label_encoder_genre.classes_:
-    # Add "unknown" to the classes_
-    label_encoder_genre.classes_ = np.append(label_encoder_genre.classes_, "unknown")
-    genre_encoded = label_encoder_genre.transform(["unknown"])[0]
-else:
-    genre_encoded = label_encoder_genre.transform([new_genre])[0]
+# New authors and genres get the encoder's reserved unknown code
+author_encoded = label_encoder_author.transform([new_author])[0]
+genre_encoded = label_encoder_genre.transform([new_genre])[0]
 
 # Create new data point
 new_data = pd.DataFrame({
@@ -1,29 +1,128 @@
 import os
 import csv
-from transformers import pipeline
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
+import hashlib
+import threading
+from sentiment_cache import normalize_review_text
+import review_classifier
+from review_classifier import default_classifier
 
 '''
 Scrape book reviews from Goodreads.
 Analyze their sentiment using a pre-trained Hugging Face DistilBERT model.
 Categorize reviews into "Ending", "Journey", or General themes.
 Save the results into a CSV file.
+
+Heavy dependencies (transformers, selenium, BeautifulSoup) are imported only
+when they are first needed so that importing this module stays cheap.
 '''
 
-# Load Hugging Face sentiment analysis model
-sentiment_analyzer = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+# classify_review used to be defined here; it stays importable from this module
+classify_review = review_classifier.classify_review
 
+# Folder where each book's review CSV is saved
+DEFAULT_SAVE_FOLDER = '/Users/25rao/PycharmProjects/Project4_Books/CSV'
+
+SENTIMENT_MODEL_ID = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Available inference backends:
+#   "pytorch"   - the original fp32 PyTorch model
+#   "quantized" - PyTorch with linear layers dynamically quantised to int8
+#   "onnx"      - the model exported to ONNX and run with ONNX Runtime
+SENTIMENT_BACKENDS = ("pytorch", "quantized", "onnx")
+_sentiment_backend = os.environ.get("SENTIMENT_BACKEND", "pytorch")
+
+# Folder where the exported ONNX graph is kept so it is only exported once
+ONNX_EXPORT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'onnx')
+
+# Process-wide Hugging Face sentiment analysis models, one per backend, created on first use
+_sentiment_analyzers = {}
+_sentiment_analyzer_lock = threading.Lock()
+
+
+# Function to choose the inference backend used when none is given explicitly
+def set_sentiment_backend(backend):
+    global _sentiment_backend
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{backend}'. Choose one of {SENTIMENT_BACKENDS}.")
+    _sentiment_backend = backend
+
+
+# Function to build a sentiment pipeline for the given backend
+def _build_sentiment_analyzer(backend):
+    from transformers import pipeline
+
+    if backend == "pytorch":
+        return pipeline("sentiment-analysis", model=SENTIMENT_MODEL_ID)
+
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_ID)
+
+    if backend == "quantized":
+        import torch
+        from transformers import AutoModelForSequenceClassification
+        model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_ID)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        export_path = os.path.join(ONNX_EXPORT_FOLDER, SENTIMENT_MODEL_ID)
+        if os.path.isdir(export_path):
+            model = ORTModelForSequenceClassification.from_pretrained(export_path)
+        else:
+            model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_ID, export=True)
+            model.save_pretrained(export_path)
+    else:
+        raise ValueError(f"Unknown sentiment backend '{backend}'. Choose one of {SENTIMENT_BACKENDS}.")
+
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+
+# Function to get the shared sentiment model, loading it on the first call
+def get_sentiment_analyzer(backend=None):
+    backend = backend or _sentiment_backend
+    if backend not in _sentiment_analyzers:
+        with _sentiment_analyzer_lock:
+            if backend not in _sentiment_analyzers:
+                _sentiment_analyzers[backend] = _build_sentiment_analyzer(backend)
+    return _sentiment_analyzers[backend]
+
+
+# Function to get the id under which a backend's scores are cached
+def _cache_model_id(backend=None):
+    backend = backend or _sentiment_backend
+    # Keep the plain model id for the original backend so existing cache entries stay valid
+    return SENTIMENT_MODEL_ID if backend == "pytorch" else f"{SENTIMENT_MODEL_ID}:{backend}"
+
+
+# Process-wide sentiment score cache, opened on first use
+_sentiment_cache = None
+_sentiment_cache_lock = threading.Lock()
+
+
+# Function to get the shared on-disk sentiment cache
+def get_sentiment_cache():
+    global _sentiment_cache
+    if _sentiment_cache is None:
+        with _sentiment_cache_lock:
+            if _sentiment_cache is None:
+                from sentiment_cache import SentimentCache
+                _sentiment_cache = SentimentCache()
+    return _sentiment_cache
 
-# Function to analyze sentiment using DistilBERT
-def analyze_sentiment_bert(text):
-    result = sentiment_analyzer(text[:512])  # Truncate text to max token length (512)
-    label = result[0]['label']
-    score = result[0]['score']
+
+# Number of text windows sent through the model in a single forward pass
+DEFAULT_BATCH_SIZE = 32
+
+# Long reviews are split into windows of at most this many tokens (the model
+# takes 512 including the [CLS] and [SEP] tokens), overlapping by WINDOW_OVERLAP
+# tokens so that sentences on a window boundary are seen whole at least once.
+MAX_WINDOW_TOKENS = 510
+WINDOW_OVERLAP = 64
+
+
+# Function to turn a raw pipeline result into a (label, signed score) pair
+def _signed_result(result):
+    label = result['label']
+    score = result['score']
 
     # Assign negative confidence score for negative sentiment
     if label == "NEGATIVE":
@@ -31,78 +130,279 @@ def analyze_sentiment_bert(text):
     return label, score
 
 
-# Function to classify reviews into "Ending" or "Journey" categories
-def classify_review(content):
-    if any(keyword in content.lower() for keyword in ["ending", "final", "conclusion", "last chapter", "wrap up", "cliffhanger"]):
-        return "Ending"
-    elif any(keyword in content.lower() for keyword in ["journey", "plot", "story", "characters", "development"]):
-        return "Journey"
-    else:
-        return "General"
+# Function to split reviews into overlapping token windows
+def _split_into_windows(texts, tokenizer, max_tokens=MAX_WINDOW_TOKENS, overlap=WINDOW_OVERLAP):
+    """
+    Split each review into windows that fit the model's token limit.
 
+    Returns:
+        tuple: (window texts, index of the review each window came from,
+        number of tokens in each window).
+    """
+    windows, owners, lengths = [], [], []
+    step = max_tokens - overlap
+    token_ids = tokenizer(list(texts), add_special_tokens=False)['input_ids']
 
-# Function to scrape Goodreads reviews
-def scrape_goodreads(url, book_title, save_folder='/Users/25rao/PycharmProjects/Project4_Books/CSV'):
+    for review_index, (text, ids) in enumerate(zip(texts, token_ids)):
+        # Short reviews are scored as-is
+        if len(ids) <= max_tokens:
+            windows.append(text)
+            owners.append(review_index)
+            lengths.append(max(len(ids), 1))
+            continue
+
+        for start in range(0, len(ids), step):
+            window_ids = ids[start:start + max_tokens]
+            windows.append(tokenizer.decode(window_ids))
+            owners.append(review_index)
+            lengths.append(len(window_ids))
+            if start + max_tokens >= len(ids):
+                break
+
+    return windows, owners, lengths
+
+
+# Function to analyze sentiment using DistilBERT
+def analyze_sentiment_bert(text):
+    return analyze_sentiment_batch([text])[0]
+
+
+# Function to analyze the sentiment of many reviews in batches
+def analyze_sentiment_batch(texts, batch_size=DEFAULT_BATCH_SIZE, use_cache=True, backend=None):
     """
-    Scrape reviews from Goodreads and perform sentiment analysis.
+    Analyze sentiment for a list of reviews using batched DistilBERT inference.
+
+    Reviews already present in the sentiment cache are answered from it and
+    only the remaining reviews are sent through the model; their results are
+    added to the cache afterwards.
 
     Parameters:
-        url (str): The Goodreads page URL.
+        texts (list[str]): Review texts to score.
+        batch_size (int): Number of text windows per forward pass.
+        use_cache (bool): Whether to read from and write to the sentiment cache.
+        backend (str): Inference backend to use; defaults to the one set with
+            set_sentiment_backend() or the SENTIMENT_BACKEND environment variable.
+
+    Returns:
+        list[tuple[str, float]]: (label, signed confidence score) for each review.
+    """
+    if not use_cache:
+        return _score_reviews(texts, batch_size, backend)
+
+    model_id = _cache_model_id(backend)
+    cache = get_sentiment_cache()
+    results = [None] * len(texts)
+    for i, cached in cache.get_many(texts, model_id).items():
+        results[i] = cached
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        scored = _score_reviews(missing_texts, batch_size, backend)
+        cache.put_many(missing_texts, model_id, scored)
+        for i, result in zip(missing, scored):
+            results[i] = result
+    return results
+
+
+# Function to run reviews through the sentiment model
+def _score_reviews(texts, batch_size=DEFAULT_BATCH_SIZE, backend=None):
+    """
+    Score reviews with the sentiment model, bypassing the cache.
+
+    Reviews longer than the model's token limit are split into overlapping
+    token windows. The windows of all reviews are ordered by length and scored
+    together in shared batches, so that each batch holds texts of similar size
+    and little padding is wasted. Window scores are then averaged back into a
+    single score per review, weighted by window length. Results are returned
+    in the same order as the input.
+    """
+    if not texts:
+        return []
+
+    sentiment_analyzer = get_sentiment_analyzer(backend)
+    windows, owners, lengths = _split_into_windows(texts, sentiment_analyzer.tokenizer)
+    order = sorted(range(len(windows)), key=lambda i: lengths[i])
+
+    window_scores = [0.0] * len(windows)
+    for start in range(0, len(order), batch_size):
+        batch_indices = order[start:start + batch_size]
+        outputs = sentiment_analyzer([windows[i] for i in batch_indices],
+                                     batch_size=len(batch_indices), truncation=True)
+        for i, output in zip(batch_indices, outputs):
+            window_scores[i] = _signed_result(output)[1]
+
+    # Combine window scores into one length-weighted score per review
+    weighted_sums = [0.0] * len(texts)
+    total_lengths = [0] * len(texts)
+    for owner, length, score in zip(owners, lengths, window_scores):
+        weighted_sums[owner] += score * length
+        total_lengths[owner] += length
+
+    results = []
+    for weighted_sum, total_length in zip(weighted_sums, total_lengths):
+        score = weighted_sum / total_length
+        results.append(("NEGATIVE" if score < 0 else "POSITIVE", score))
+    return results
+
+
+# Columns of a book's review CSV file
+REVIEW_CSV_COLUMNS = ['Review', 'Category', 'Sentiment', 'Confidence Score', 'Review ID']
+
+
+# Function to compute a stable id for a review from its normalised text
+def review_id(content):
+    return hashlib.sha1(normalize_review_text(content).encode('utf-8')).hexdigest()[:16]
+
+
+# Function to get the path of a book's review CSV file
+def review_csv_path(book_title, save_folder=DEFAULT_SAVE_FOLDER):
+    return os.path.join(save_folder, f"{book_title}_reviews_sentiment.csv")
+
+
+# Function to classify, score and save a book's reviews
+def save_review_sentiment(contents, book_title, save_folder, delta=False, use_cache=True):
+    """
+    Classify and score review texts and write them to the book's CSV file.
+
+    Parameters:
+        contents (list[str]): Review texts.
         book_title (str): The title of the book (used for CSV filename).
         save_folder (str): Folder to save the CSV file.
+        delta (bool): Only score reviews not already stored for this book and
+            add them to its existing file instead of replacing it.
+        use_cache (bool): Answer reviews from the sentiment cache or the running
+            prediction service; with False every review goes through the model
+            in this process.
 
     Returns:
         str: Path to the saved CSV file.
     """
-    try:
-        # Set up Selenium WebDriver with options
-        options = Options()
-        options.page_load_strategy = 'normal'
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
+    file_path = review_csv_path(book_title, save_folder)
+    append = False
+    if delta and os.path.exists(file_path):
+        stored_ids = _upgrade_review_csv(file_path)
 
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+        # Bring the book's earlier reviews into the Parquet dataset before appending to it
+        from review_dataset import has_book, import_review_csv
+        if not has_book(save_folder, book_title):
+            import_review_csv(file_path, book_title, save_folder)
 
-        # Set timeouts
-        driver.set_page_load_timeout(120)
+        # Keep each review not stored yet, once
+        new_contents = []
+        for content in contents:
+            content_id = review_id(content)
+            if content_id not in stored_ids:
+                stored_ids.add(content_id)
+                new_contents.append(content)
+        if not new_contents:
+            return file_path
+        contents, append = new_contents, True
 
-        try:
-            driver.get(url)
-        except TimeoutException:
-            driver.quit()
-            raise TimeoutException("The page took too long to load. Try again later.")
+    # Use the prediction service's loaded model when it is running
+    from prediction_service import get_service_client
+    client = get_service_client() if use_cache else None
+    if client is not None:
+        categories, sentiments = client.score_reviews(contents)
+    else:
+        # Score every review in batches rather than one forward pass each
+        sentiments = analyze_sentiment_batch(contents, use_cache=use_cache)
+        categories = default_classifier.classify_batch(contents)
+    return write_reviews(book_title, contents, categories, sentiments, save_folder, append)
 
-        # Parse the page source with BeautifulSoup
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        driver.quit()
 
-        # Extract reviews
-        reviews = soup.find_all('section', class_='ReviewText__content')
+# Function to write scored reviews to the book's CSV file, the Parquet review dataset and the book store
+def write_reviews(book_title, contents, categories, sentiments, save_folder=DEFAULT_SAVE_FOLDER, append=False):
+    from review_dataset import write_book_reviews
+    from book_store import get_book_store
 
-        if not reviews:
-            raise ValueError("No reviews found on the provided page.")
+    # The CSV goes first: delta mode reads the stored review ids from it, so reviews
+    # must never reach the dataset or the store without being in the CSV as well
+    file_path = write_review_csv(book_title, contents, categories, sentiments, save_folder, append)
+    write_book_reviews(book_title, contents, categories, sentiments, save_folder, append)
+    get_book_store().upsert_reviews(
+        book_title,
+        [(review_id(content), content, category, sentiment_label, confidence_score)
+         for content, category, (sentiment_label, confidence_score) in zip(contents, categories, sentiments)],
+        replace=not append)
+    return file_path
 
-        # Ensure the save folder exists
-        os.makedirs(save_folder, exist_ok=True)
 
-        # Define the CSV file path
-        file_path = os.path.join(save_folder, f"{book_title}_reviews_sentiment.csv")
+# Function to read the ids stored in a review CSV, adding the id column to older files
+def _upgrade_review_csv(file_path):
+    with open(file_path, newline='', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        has_ids = 'Review ID' in (reader.fieldnames or [])
+        if has_ids:
+            return {row['Review ID'] for row in reader}
+        rows = list(reader)
 
-        # Save reviews and sentiment to CSV
-        with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Review', 'Category', 'Sentiment', 'Confidence Score'])
+    # Files written before review ids existed are rewritten once with the column filled in
+    for row in rows:
+        row['Review ID'] = review_id(row.get('Review') or "")
+    with open(file_path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=REVIEW_CSV_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    return {row['Review ID'] for row in rows}
 
-            for review in reviews:
-                content_div = review.find('div', class_='TruncatedContent__text')
-                content = content_div.text.strip() if content_div else "No content"
-                category = classify_review(content)
-                sentiment_label, confidence_score = analyze_sentiment_bert(content)
-                writer.writerow([content, category, sentiment_label, confidence_score])
 
-        return file_path
+# Function to write already classified and scored reviews to the book's CSV file
+def write_review_csv(book_title, contents, categories, sentiments, save_folder=DEFAULT_SAVE_FOLDER, append=False):
+    # Ensure the save folder exists
+    os.makedirs(save_folder, exist_ok=True)
+
+    # Define the CSV file path
+    file_path = review_csv_path(book_title, save_folder)
+
+    # Save reviews and sentiment to CSV
+    with open(file_path, mode='a' if append else 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        if not append:
+            writer.writerow(REVIEW_CSV_COLUMNS)
+
+        for content, category, (sentiment_label, confidence_score) in zip(contents, categories, sentiments):
+            writer.writerow([content, category, sentiment_label, confidence_score, review_id(content)])
+
+    return file_path
+
+
+# Function to scrape Goodreads reviews
+def scrape_goodreads(url, book_title, save_folder=DEFAULT_SAVE_FOLDER, max_reviews=None, delta=False):
+    """
+    Scrape reviews from Goodreads and perform sentiment analysis.
+
+    Parameters:
+        url (str): The Goodreads page URL.
+        book_title (str): The title of the book (used for CSV filename).
+        save_folder (str): Folder to save the CSV file.
+        max_reviews (int): If given, click "Show more reviews" in a browser
+            until this many reviews are loaded (or none are left).
+        delta (bool): Only score reviews that are not already in the book's
+            CSV file and add them to it.
+
+    Returns:
+        str: Path to the saved CSV file.
+    """
+    from page_fetcher import fetch_page
+    from review_extractor import extract_reviews
+
+    try:
+        if max_reviews:
+            # Expand the review list in a browser, reading only new reviews after each click
+            from review_expander import fetch_expanded_reviews
+            contents = fetch_expanded_reviews(url, max_reviews)
+        else:
+            # Fetch over HTTP when possible, otherwise through a pooled browser session
+            page = fetch_page(url)
+
+            # Extract the review texts from the page
+            contents = extract_reviews(page.html)
+
+        if not contents:
+            raise ValueError("No reviews found on the provided page.")
+
+        return save_review_sentiment(contents, book_title, save_folder, delta)
 
     except Exception as e:
         raise RuntimeError(f"An error occurred: {e}")
\ No newline at end of file
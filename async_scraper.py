@@ -0,0 +1,207 @@
+import csv
+import time
+import asyncio
+import argparse
+from urllib.parse import urlsplit
+
+'''
+Scrape many Goodreads books concurrently with asyncio.
+
+Pages are fetched over HTTP with a bounded number of requests in flight per
+host and a token-bucket rate limit, so the scraper stays polite while many
+page loads wait on the network at once. As soon as a page arrives its reviews
+are extracted and handed to a single scoring worker, which classifies, scores
+and saves them while the remaining pages are still downloading. Pages whose
+HTTP response has no reviews fall back to a browser from the WebDriver pool,
+under the same per-host limits.
+'''
+
+DEFAULT_CONCURRENCY_PER_HOST = 4
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_BURST = 4
+DEFAULT_TIMEOUT = 60
+
+# Parsed books waiting to be scored; bounded so fetching cannot run far ahead of scoring
+SCORING_QUEUE_SIZE = 8
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostLimiter:
+    """Per-host concurrency limit and rate limit."""
+
+    def __init__(self, concurrency, rate, burst):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self._semaphores = {}
+        self._buckets = {}
+
+    def _for_host(self, host):
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.concurrency)
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._semaphores[host], self._buckets[host]
+
+    async def run(self, url, make_request):
+        semaphore, bucket = self._for_host(urlsplit(url).netloc)
+        async with semaphore:
+            await bucket.acquire()
+            return await make_request()
+
+
+async def _fetch_html(session, limiter, url, timeout):
+    import aiohttp
+    from page_fetcher import DEFAULT_HEADERS, has_review_sections, fetch_with_browser, save_snapshot
+
+    async def request():
+        async with session.get(url, headers=DEFAULT_HEADERS,
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status != 200:
+                return None
+            return await response.text()
+
+    try:
+        html = await limiter.run(url, request)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        html = None
+
+    if html is not None and has_review_sections(html):
+        source = 'http'
+    else:
+        # Reviews are rendered by JavaScript on this page; load it in a pooled browser,
+        # under the same per-host limits and timeout as the HTTP request
+        async def browser_request():
+            return await asyncio.wait_for(asyncio.to_thread(fetch_with_browser, url), timeout)
+
+        html = await limiter.run(url, browser_request)
+        source = 'selenium'
+
+    await asyncio.to_thread(save_snapshot, url, html, source)
+    return html
+
+
+async def _fetch_book(session, limiter, book_title, url, timeout, scoring_queue, results):
+    from review_extractor import extract_reviews
+
+    try:
+        html = await _fetch_html(session, limiter, url, timeout)
+        contents = await asyncio.to_thread(extract_reviews, html)
+        if not contents:
+            raise ValueError("No reviews found on the provided page.")
+    except Exception as e:
+        results[book_title] = {'file': None, 'error': str(e) or type(e).__name__}
+        print(f"Error scraping '{book_title}': {results[book_title]['error']}")
+        return
+    await scoring_queue.put((book_title, contents))
+
+
+async def _score_books(scoring_queue, save_folder, results):
+    from ScrapeSentiment_Function import save_review_sentiment
+
+    # The sentiment model is not shared across threads, so books are scored one at a time
+    while True:
+        item = await scoring_queue.get()
+        if item is None:
+            return
+        book_title, contents = item
+        try:
+            file_path = await asyncio.to_thread(save_review_sentiment, contents, book_title, save_folder)
+            results[book_title] = {'file': file_path, 'error': None}
+            print(f"Reviews for '{book_title}' successfully saved to {file_path}")
+        except Exception as e:
+            results[book_title] = {'file': None, 'error': str(e) or type(e).__name__}
+            print(f"Error scoring '{book_title}': {results[book_title]['error']}")
+
+
+async def scrape_books_async(books, save_folder=None,
+                             concurrency_per_host=DEFAULT_CONCURRENCY_PER_HOST,
+                             requests_per_second=DEFAULT_REQUESTS_PER_SECOND,
+                             burst=DEFAULT_BURST, timeout=DEFAULT_TIMEOUT):
+    """
+    Fetch, score and save reviews for many books concurrently.
+
+    Parameters:
+        books (list[tuple[str, str]]): (book title, Goodreads URL) pairs.
+        save_folder (str): Folder for the review CSVs (defaults to scrape_goodreads' folder).
+        concurrency_per_host (int): Maximum requests in flight to one host.
+        requests_per_second (float): Average request rate allowed per host.
+        burst (int): Requests allowed back to back before the rate limit applies.
+        timeout (float): Seconds allowed for each HTTP request.
+
+    Returns:
+        dict: Maps each book title to {'file': CSV path or None, 'error': message or None}.
+    """
+    import aiohttp
+    from ScrapeSentiment_Function import DEFAULT_SAVE_FOLDER
+
+    save_folder = save_folder or DEFAULT_SAVE_FOLDER
+    results = {}
+    limiter = HostLimiter(concurrency_per_host, requests_per_second, burst)
+    scoring_queue = asyncio.Queue(maxsize=SCORING_QUEUE_SIZE)
+    scorer = asyncio.create_task(_score_books(scoring_queue, save_folder, results))
+
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency_per_host)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(
+            _fetch_book(session, limiter, book_title, url, timeout, scoring_queue, results)
+            for book_title, url in books
+        ))
+
+    await scoring_queue.put(None)
+    await scorer
+    return results
+
+
+# Function to read (book title, url) pairs from a book list CSV
+def read_book_list(csv_file):
+    books = []
+    with open(csv_file, mode='r', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader)  # Skip header row
+        for row in reader:
+            if len(row) < 2:
+                print("Invalid row format. Skipping.")
+                continue
+            books.append((row[0], row[1]))
+    return books
+
+
+# Function to process books from a CSV file concurrently
+def process_books_from_csv_async(csv_file, **kwargs):
+    results = asyncio.run(scrape_books_async(read_book_list(csv_file), **kwargs))
+    failed = sum(1 for result in results.values() if result['error'])
+    print(f"Finished {len(results)} books ({failed} failed).")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape a list of Goodreads books concurrently.")
+    parser.add_argument('csv_file', help="CSV of book title, Goodreads URL rows (with a header row).")
+    parser.add_argument('--save-folder')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY_PER_HOST)
+    parser.add_argument('--rate', type=float, default=DEFAULT_REQUESTS_PER_SECOND)
+    args = parser.parse_args()
+
+    process_books_from_csv_async(args.csv_file, save_folder=args.save_folder,
+                                 concurrency_per_host=args.concurrency, requests_per_second=args.rate)
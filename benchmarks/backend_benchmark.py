@@ -0,0 +1,80 @@
+import os
+import sys
+import csv
+import glob
+import time
+import argparse
+
+'''
+Compare the sentiment inference backends on throughput and agreement.
+
+Every backend scores the same reviews with the sentiment cache bypassed. The
+"pytorch" backend is the reference: for the others the script reports how
+often the label matches and the largest difference in signed score.
+
+Usage:
+    python benchmarks/backend_benchmark.py --reviews-folder CSV --limit 500
+'''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ScrapeSentiment_Function import SENTIMENT_BACKENDS, get_sentiment_analyzer, _score_reviews
+
+SAMPLE_REVIEWS = [
+    "The ending was rushed and left every thread hanging. I felt cheated.",
+    "I loved the characters and the slow, careful development of the plot.",
+    "Solid story, forgettable prose, and a final chapter that almost saved it.",
+    "Not for me. The journey dragged and the conclusion made no sense.",
+    "An absolute delight from start to finish, with a perfect wrap up.",
+]
+
+
+# Function to load review texts from scraped review CSVs
+def load_reviews(folder, limit):
+    reviews = []
+    for path in sorted(glob.glob(os.path.join(folder, '*.csv'))):
+        with open(path, newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                if row.get('Review'):
+                    reviews.append(row['Review'])
+                if len(reviews) >= limit:
+                    return reviews
+    return reviews
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sentiment inference backends.")
+    parser.add_argument('--reviews-folder', help="Folder of *_reviews_sentiment.csv files to sample from.")
+    parser.add_argument('--limit', type=int, default=500, help="Number of reviews to score.")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help="Largest acceptable score difference from the pytorch backend.")
+    args = parser.parse_args()
+
+    reviews = load_reviews(args.reviews_folder, args.limit) if args.reviews_folder else []
+    if not reviews:
+        reviews = (SAMPLE_REVIEWS * (args.limit // len(SAMPLE_REVIEWS) + 1))[:args.limit]
+
+    reference = None
+    for backend in SENTIMENT_BACKENDS:
+        load_start = time.perf_counter()
+        get_sentiment_analyzer(backend)
+        load_time = time.perf_counter() - load_start
+
+        start = time.perf_counter()
+        results = _score_reviews(reviews, args.batch_size, backend)
+        elapsed = time.perf_counter() - start
+
+        line = f"{backend:<10} load {load_time:6.2f}s  {len(reviews) / elapsed:8.1f} reviews/s"
+        if reference is None:
+            reference = results
+        else:
+            agreement = sum(a[0] == b[0] for a, b in zip(results, reference)) / len(reviews)
+            max_diff = max(abs(a[1] - b[1]) for a, b in zip(results, reference))
+            status = "OK" if max_diff <= args.tolerance else "OUT OF TOLERANCE"
+            line += f"  label agreement {agreement:.1%}  max score diff {max_diff:.4f}  {status}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
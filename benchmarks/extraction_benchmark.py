@@ -0,0 +1,108 @@
+import os
+import sys
+import glob
+import time
+import argparse
+
+'''
+Compare the review extraction backends on saved Goodreads pages.
+
+Each backend extracts reviews from the same pages; the script reports the
+time per page and checks that every backend returns exactly what a full
+BeautifulSoup parse returns. Pages can be plain HTML files or the latest
+snapshot of every URL in the snapshot store. Without saved pages, a large
+synthetic page with the same structure as an expanded Goodreads review list
+is used.
+
+Usage:
+    python benchmarks/extraction_benchmark.py --snapshots --repeat 5
+    python benchmarks/extraction_benchmark.py --pages "saved_pages/*.html"
+'''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from review_extractor import available_backends, extract_reviews, REVIEW_SECTION_CLASS, REVIEW_TEXT_CLASS
+
+FILLER = '<div class="ReviewCard__meta"><a href="/user/show/1">Reader</a><span>5 stars</span></div>' * 20
+
+
+# Function to build a page roughly the size of an expanded review list
+def synthetic_page(review_count=600):
+    sections = []
+    for i in range(review_count):
+        sections.append(
+            f'<article class="ReviewCard">{FILLER}'
+            f'<section class="{REVIEW_SECTION_CLASS}"><div class="{REVIEW_TEXT_CLASS}">'
+            f'<span class="Formatted">Review {i}: the plot moved slowly but the ending <b>landed</b>.</span>'
+            f'</div></section></article>'
+        )
+    return f'<html><head><title>Book</title></head><body>{"".join(sections)}</body></html>'
+
+
+# Function to extract reviews the way scrape_goodreads originally did
+def full_soup_reviews(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    reviews = []
+    for review in soup.find_all('section', class_=REVIEW_SECTION_CLASS):
+        content_div = review.find('div', class_=REVIEW_TEXT_CLASS)
+        reviews.append(content_div.text.strip() if content_div else "No content")
+    return reviews
+
+
+# Function to read the latest stored snapshot of every URL
+def snapshot_pages(root=None):
+    from snapshot_store import SnapshotStore, DEFAULT_SNAPSHOT_FOLDER
+
+    store = SnapshotStore(root or DEFAULT_SNAPSHOT_FOLDER)
+    try:
+        return [store.load(store.latest(url)) for url in store.urls()]
+    finally:
+        store.close()
+
+
+def time_per_page(extract, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            extract(html)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare review extraction backends.")
+    parser.add_argument('--pages', help="Glob of saved Goodreads HTML pages.")
+    parser.add_argument('--snapshots', nargs='?', const='', metavar='FOLDER',
+                        help="Use the snapshot store (optionally at FOLDER) as the pages.")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.pages)) if args.pages else []
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            pages.append(file.read())
+    if args.snapshots is not None:
+        pages.extend(snapshot_pages(args.snapshots or None))
+    if not pages:
+        if args.pages or args.snapshots is not None:
+            print("No saved pages found; using a synthetic page.")
+        pages = [synthetic_page()]
+
+    size_mb = sum(len(html) for html in pages) / len(pages) / 1e6
+    print(f"{len(pages)} page(s), {size_mb:.2f} MB average")
+
+    expected = [full_soup_reviews(html) for html in pages]
+    baseline = time_per_page(full_soup_reviews, pages, args.repeat)
+    print(f"{'full soup':<13} {baseline * 1000:8.1f} ms/page")
+
+    for backend in available_backends():
+        matches = all(extract_reviews(html, backend) == reviews for html, reviews in zip(pages, expected))
+        elapsed = time_per_page(lambda html: extract_reviews(html, backend), pages, args.repeat)
+        print(f"{backend:<13} {elapsed * 1000:8.1f} ms/page  {baseline / elapsed:5.1f}x  "
+              f"{'same output' if matches else 'OUTPUT DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+'''
+Compare incremental model updates with full retrains as the rated library grows.
+
+Builds a synthetic table of rated books, then for growing library sizes times
+adding a handful of newly rated books with model_b.update_model against
+retraining with model_b.train_model, and finally runs
+model_b.check_incremental_quality to compare their accuracy.
+
+Usage:
+    python benchmarks/incremental_benchmark.py --books 20000 --new 5
+'''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from model_b import train_model, update_model, check_incremental_quality
+
+SCORES = [score for score in range(-5, 6) if score != 0]
+
+
+# Function to write a synthetic rated library shaped like all_books_scores.csv
+def make_books(books, authors=50, genres=8):
+    rng = random.Random(0)
+    rows = []
+    for i in range(books):
+        ending, journey = rng.uniform(-1, 1), rng.uniform(-1, 1)
+        score = max(-5, min(5, round(3 * ending + 2 * journey))) or 1
+        rows.append({'Book Title': f"Book {i}", 'Ending Score': ending, 'Journey Score': journey,
+                     'Author': f"Author {rng.randrange(authors)}", 'Genre': f"Genre {rng.randrange(genres)}",
+                     'My Score': score})
+    df = pd.DataFrame(rows)
+    # Make sure every score is present from the start
+    df.loc[:len(SCORES) - 1, 'My Score'] = SCORES
+    return df
+
+
+def timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare incremental model updates with full retrains.")
+    parser.add_argument('--books', type=int, default=20000)
+    parser.add_argument('--new', type=int, default=5, help="Newly rated books added per update.")
+    args = parser.parse_args()
+
+    books = make_books(args.books)
+    print(f"{'rated books':>12} {'full retrain':>14} {'update':>10}")
+    size = 500
+    while size <= args.books:
+        seen = books.iloc[:size - args.new]
+        artifact = train_model(seen)
+        full = timed(lambda: train_model(books.iloc[:size]))
+        update = timed(lambda: update_model(artifact, books.iloc[:size], books.iloc[size - args.new:size]))
+        print(f"{size:>12} {full:>13.2f}s {update:>9.2f}s")
+        size *= 2
+
+    quality = check_incremental_quality(books)
+    print(f"accuracy: incremental {quality['incremental_accuracy']:.3f}, full retrain "
+          f"{quality['full_accuracy']:.3f}, gap {quality['gap']:+.3f} "
+          f"({'within' if quality['within_tolerance'] else 'outside'} tolerance, {quality['rebuilds']} rebuilds)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+'''
+Compare loading a folder of review CSVs the old way and with review_loader.
+
+Writes a folder of synthetic review files (each with long review text), then
+times reading them one by one with untyped pd.read_csv against
+load_review_files with and without a thread pool, and reports the memory of
+the resulting DataFrames.
+
+Usage:
+    python benchmarks/loader_benchmark.py --files 3000 --reviews 30
+'''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import review_loader
+from review_loader import load_review_files
+
+WORDS = "the plot story ending characters final journey slow brilliant rushed quiet dark".split()
+
+
+# Function to write synthetic review files shaped like scrape_goodreads output
+def write_files(folder, files, reviews):
+    rng = random.Random(0)
+    paths = []
+    for i in range(files):
+        df = pd.DataFrame({
+            'Review': [' '.join(rng.choices(WORDS, k=200)) for _ in range(reviews)],
+            'Category': rng.choices(['Ending', 'Journey', 'General'], k=reviews),
+            'Sentiment': rng.choices(['POSITIVE', 'NEGATIVE'], k=reviews),
+            'Confidence Score': [rng.uniform(-1, 1) for _ in range(reviews)],
+        })
+        path = os.path.join(folder, f"Book {i}_reviews_sentiment.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def untyped_load(paths):
+    frames = []
+    for path in paths:
+        df = pd.read_csv(path)
+        df['book'] = os.path.basename(path)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(label, load):
+    start = time.perf_counter()
+    df = load()
+    elapsed = time.perf_counter() - start
+    memory = df.memory_usage(deep=True).sum() / 1e6
+    print(f"{label:<32} {elapsed:7.2f}s  {memory:9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare review CSV loading strategies.")
+    parser.add_argument('--files', type=int, default=3000)
+    parser.add_argument('--reviews', type=int, default=30, help="Reviews per file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_files(folder, args.files, args.reviews)
+        labels = [os.path.basename(path) for path in paths]
+        print(f"{len(paths)} files, {args.reviews} reviews each, CSV engine: {review_loader._csv_engine()}")
+
+        timed("untyped read_csv, one by one", lambda: untyped_load(paths))
+        timed("typed loader, one thread", lambda: load_review_files(paths, labels=labels, workers=1)[0])
+        timed("typed loader, thread pool", lambda: load_review_files(paths, labels=labels)[0])
+        timed("typed loader, process pool",
+              lambda: load_review_files(paths, labels=labels, use_processes=True)[0])
+
+
+if __name__ == "__main__":
+    main()
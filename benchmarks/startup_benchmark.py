@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+'''
+Measure how long the application takes to become usable.
+
+Reports two timings, each measured from the start of this script:
+    time-to-first-window: main.py imported and its Tk window drawn.
+    time-to-first-prediction: sentiment model loaded and one review scored.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+'''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_REVIEW = "The ending was rushed, but I loved the characters and the journey to get there."
+
+
+def main():
+    start = time.perf_counter()
+
+    # Importing main builds the window without entering the main loop
+    import main as app
+    app.root.update()
+    first_window = time.perf_counter() - start
+    print(f"time-to-first-window:     {first_window:.3f}s")
+
+    # Bypass the sentiment cache so the model is loaded and run on every run
+    from ScrapeSentiment_Function import analyze_sentiment_batch
+    label, score = analyze_sentiment_batch([SAMPLE_REVIEW], use_cache=False)[0]
+    first_prediction = time.perf_counter() - start
+    print(f"time-to-first-prediction: {first_prediction:.3f}s ({label}, {score:.4f})")
+
+    app.root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+import os
+import csv
+import glob
+import time
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+
+'''
+Embedded SQLite store for books, reviews and predictions.
+
+Replaces rewriting all_books_scores.csv and the per-book *_processed.csv
+files in full on every update. Rows are upserted inside transactions, the
+tables are indexed for the lookups the workflow does, and the database runs
+in WAL mode so the GUI can read while a batch job writes.
+
+Books are keyed by their normalised title (see data_cleaner.normalize_title),
+so "The Hobbit" and "the  hobbit" are the same book.
+'''
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'books.sqlite')
+
+# Seconds a writer waits for another connection's write transaction to finish
+BUSY_TIMEOUT = 30
+
+BOOK_COLUMNS = ['Book Title', 'Author', 'Genre', 'Ending Score', 'Journey Score', 'My Score']
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    title_key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    author TEXT,
+    genre TEXT,
+    ending_score REAL,
+    journey_score REAL,
+    my_score INTEGER,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_rated ON books (my_score) WHERE my_score IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS reviews (
+    book_id INTEGER NOT NULL REFERENCES books (id) ON DELETE CASCADE,
+    review_id TEXT NOT NULL,
+    review TEXT,
+    category TEXT,
+    sentiment TEXT,
+    confidence_score REAL,
+    PRIMARY KEY (book_id, review_id)
+);
+CREATE INDEX IF NOT EXISTS reviews_category ON reviews (book_id, category);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    book_id INTEGER NOT NULL REFERENCES books (id) ON DELETE CASCADE,
+    model_version TEXT NOT NULL,
+    predicted_score INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (book_id, model_version)
+);
+CREATE INDEX IF NOT EXISTS predictions_created ON predictions (book_id, created_at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+'''
+
+
+def _title_key(title):
+    from data_cleaner import normalize_title
+    return normalize_title(title)
+
+
+def _optional(value, convert):
+    # Empty strings and NaN from CSV/pandas become NULL
+    if value is None or value == '' or value != value:
+        return None
+    return convert(value)
+
+
+class BookStore:
+    """SQLite book database with upserts, transactions and WAL mode."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        # executescript manages its own transaction
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        # One connection per thread; SQLite connections are not shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Runs the block in one write transaction, rolled back if it raises."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def upsert_books(self, books):
+        """
+        Insert or update books.
+
+        Parameters:
+            books (iterable[dict]): Rows with 'Book Title' and any of 'Author',
+                'Genre', 'Ending Score', 'Journey Score' and 'My Score'. Missing
+                or empty values never overwrite what is already stored, and a
+                stored author or genre is kept: they are model features, and
+                callers such as data_cleaner fill them from whatever the user
+                typed for the book being scraped.
+        """
+        now = time.time()
+        rows = [(
+            _title_key(book['Book Title']),
+            str(book['Book Title']),
+            _optional(book.get('Author'), str),
+            _optional(book.get('Genre'), str),
+            _optional(book.get('Ending Score'), float),
+            _optional(book.get('Journey Score'), float),
+            _optional(book.get('My Score'), lambda value: int(float(value))),
+            now,
+        ) for book in books]
+
+        with self.transaction() as conn:
+            conn.executemany('''
+                INSERT INTO books (title_key, title, author, genre, ending_score, journey_score, my_score, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (title_key) DO UPDATE SET
+                    author = COALESCE(books.author, excluded.author),
+                    genre = COALESCE(books.genre, excluded.genre),
+                    ending_score = COALESCE(excluded.ending_score, books.ending_score),
+                    journey_score = COALESCE(excluded.journey_score, books.journey_score),
+                    my_score = COALESCE(excluded.my_score, books.my_score),
+                    updated_at = excluded.updated_at
+            ''', rows)
+
+    def set_my_scores(self, scores):
+        """
+        Set the user's ratings, the model's training target.
+
+        Parameters:
+            scores (iterable[tuple]): (book title, "My Score") pairs; a score of None
+                removes the book's rating.
+
+        Returns:
+            list[str]: Titles that are not stored, and so were not rated; a book needs
+                its review scores before it can be used for training.
+        """
+        now = time.time()
+        missing = []
+        with self.transaction() as conn:
+            for title, score in scores:
+                cursor = conn.execute(
+                    'UPDATE books SET my_score = ?, updated_at = ? WHERE title_key = ?',
+                    (_optional(score, lambda value: int(float(value))), now, _title_key(title)))
+                if cursor.rowcount == 0:
+                    missing.append(title)
+        return missing
+
+    def _book_id(self, conn, title):
+        row = conn.execute('SELECT id FROM books WHERE title_key = ?', (_title_key(title),)).fetchone()
+        if row is not None:
+            return row[0]
+        cursor = conn.execute('INSERT INTO books (title_key, title, updated_at) VALUES (?, ?, ?)',
+                              (_title_key(title), str(title), time.time()))
+        return cursor.lastrowid
+
+    def upsert_reviews(self, book_title, reviews, replace=False):
+        """
+        Insert or update a book's reviews.
+
+        Parameters:
+            book_title (str): The book the reviews belong to (created if new).
+            reviews (iterable[tuple]): (review id, review text, category, sentiment, confidence score).
+            replace (bool): Remove the book's other stored reviews first.
+        """
+        with self.transaction() as conn:
+            book_id = self._book_id(conn, book_title)
+            if replace:
+                conn.execute('DELETE FROM reviews WHERE book_id = ?', (book_id,))
+            conn.executemany('''
+                INSERT INTO reviews (book_id, review_id, review, category, sentiment, confidence_score)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (book_id, review_id) DO UPDATE SET
+                    review = excluded.review,
+                    category = excluded.category,
+                    sentiment = excluded.sentiment,
+                    confidence_score = excluded.confidence_score
+            ''', [(book_id, *review) for review in reviews])
+
+    def record_predictions(self, predictions, model_version):
+        """Stores (book title, predicted score) pairs made by the given model version."""
+        now = time.time()
+        with self.transaction() as conn:
+            rows = [(self._book_id(conn, title), model_version, int(score), now) for title, score in predictions]
+            conn.executemany('''
+                INSERT INTO predictions (book_id, model_version, predicted_score, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (book_id, model_version) DO UPDATE SET
+                    predicted_score = excluded.predicted_score,
+                    created_at = excluded.created_at
+            ''', rows)
+
+    def book_labels(self, titles):
+        """Returns {title: (author, genre)} for the given titles that are stored with an author or genre."""
+        conn = self._connection()
+        labels = {}
+        for title in titles:
+            row = conn.execute('SELECT author, genre FROM books WHERE title_key = ?', (_title_key(title),)).fetchone()
+            if row is not None and (row[0] is not None or row[1] is not None):
+                labels[title] = row
+        return labels
+
+    def books_frame(self, rated_only=False):
+        """Returns the books as a DataFrame with the columns of all_books_scores.csv."""
+        import pandas as pd
+
+        query = '''
+            SELECT title, author, genre, ending_score, journey_score, my_score FROM books
+        ''' + ('WHERE my_score IS NOT NULL ' if rated_only else '') + 'ORDER BY title'
+        rows = self._connection().execute(query).fetchall()
+        df = pd.DataFrame(rows, columns=BOOK_COLUMNS)
+        df['My Score'] = df['My Score'].astype('Int64')
+        return df
+
+    def rated_books_frame(self):
+        """Returns the books that have a "My Score", i.e. the model's training data."""
+        return self.books_frame(rated_only=True)
+
+    def review_scores_frame(self, book_title):
+        """Returns a book's reviews with their category and confidence score."""
+        import pandas as pd
+
+        rows = self._connection().execute('''
+            SELECT r.review_id, r.category, r.sentiment, r.confidence_score
+            FROM reviews r JOIN books b ON b.id = r.book_id
+            WHERE b.title_key = ?
+        ''', (_title_key(book_title),)).fetchall()
+        return pd.DataFrame(rows, columns=['Review ID', 'Category', 'Sentiment', 'Confidence Score'])
+
+    def get_meta(self, key):
+        row = self._connection().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+    def export_csv(self, path):
+        """Writes the books table in the all_books_scores.csv layout."""
+        self.books_frame().to_csv(path, index=False)
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# Process-wide book store, opened on first use
+_book_store = None
+_book_store_lock = threading.Lock()
+
+
+def get_book_store():
+    """Returns the shared book store, opening it on the first call."""
+    global _book_store
+    if _book_store is None:
+        with _book_store_lock:
+            if _book_store is None:
+                _book_store = BookStore()
+    return _book_store
+
+
+def _read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+def migrate_from_csv(store, training_csv=None, processed_folder=None, review_folder=None, force=False):
+    """
+    One-time import of the existing CSV files into the book store.
+
+    Parameters:
+        store (BookStore): Store to import into.
+        training_csv (str): all_books_scores.csv (books with "My Score").
+        processed_folder (str): Folder of *_processed.csv files (books and "Predicted Score").
+        review_folder (str): Folder of *_reviews_sentiment.csv files.
+        force (bool): Import again even if a migration already ran.
+
+    Returns:
+        dict: Number of books, reviews and predictions imported.
+    """
+    from data_cleaner import book_title_from_filename
+
+    if store.get_meta('migrated_at') and not force:
+        print("CSV files were already migrated; pass force=True to import them again.")
+        return {'books': 0, 'reviews': 0, 'predictions': 0}
+
+    counts = {'books': 0, 'reviews': 0, 'predictions': 0}
+
+    if training_csv and os.path.exists(training_csv):
+        rows = [row for row in _read_rows(training_csv) if row.get('Book Title')]
+        store.upsert_books(rows)
+        store.set_meta('scores_synced_mtime', str(os.stat(training_csv).st_mtime_ns))
+        counts['books'] += len(rows)
+
+    if processed_folder and os.path.isdir(processed_folder):
+        for path in sorted(glob.glob(os.path.join(processed_folder, '*_processed.csv'))):
+            rows = [row for row in _read_rows(path) if row.get('Book Title')]
+            store.upsert_books(rows)
+            counts['books'] += len(rows)
+            predictions = [(row['Book Title'], float(row['Predicted Score'])) for row in rows
+                           if row.get('Predicted Score') not in (None, '')]
+            if predictions:
+                store.record_predictions(predictions, model_version='csv-migration')
+                counts['predictions'] += len(predictions)
+
+    if review_folder and os.path.isdir(review_folder):
+        from ScrapeSentiment_Function import review_id
+        for path in sorted(glob.glob(os.path.join(review_folder, '*_reviews_sentiment.csv'))):
+            reviews = [(
+                row.get('Review ID') or review_id(row.get('Review') or ''),
+                row.get('Review'),
+                row.get('Category'),
+                row.get('Sentiment'),
+                _optional(row.get('Confidence Score'), float),
+            ) for row in _read_rows(path)]
+            store.upsert_reviews(book_title_from_filename(path), reviews)
+            counts['reviews'] += len(reviews)
+
+    store.set_meta('migrated_at', str(time.time()))
+    print(f"Migrated {counts['books']} book rows, {counts['reviews']} reviews and "
+          f"{counts['predictions']} predictions into {store.path}")
+    return counts
+
+
+def sync_scores_from_csv(store, training_csv):
+    """
+    Copy all_books_scores.csv into the store when the file has changed.
+
+    Ratings are still entered in the CSV after the migration; this keeps the
+    store's training data in step with them. As with upsert_books, empty
+    values in the CSV leave what the store has.
+
+    Returns:
+        int: Number of rows copied (0 when the file is missing or unchanged).
+    """
+    if not training_csv or not os.path.exists(training_csv):
+        return 0
+    mtime = str(os.stat(training_csv).st_mtime_ns)
+    if store.get_meta('scores_synced_mtime') == mtime:
+        return 0
+
+    rows = [row for row in _read_rows(training_csv) if row.get('Book Title')]
+    store.upsert_books(rows)
+    store.set_meta('scores_synced_mtime', mtime)
+    return len(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the existing CSV files into the book store.")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--training-csv', help="all_books_scores.csv")
+    parser.add_argument('--processed-folder', help="Folder of *_processed.csv files.")
+    parser.add_argument('--reviews-folder', help="Folder of *_reviews_sentiment.csv files.")
+    parser.add_argument('--force', action='store_true')
+    parser.add_argument('--rate', nargs=2, action='append', metavar=('TITLE', 'SCORE'),
+                        help="Set a book's \"My Score\" instead of migrating; can be repeated.")
+    args = parser.parse_args()
+
+    if args.rate:
+        missing = BookStore(args.db).set_my_scores(args.rate)
+        for title in missing:
+            print(f"'{title}' is not in the book store; score its reviews first.")
+        print(f"Rated {len(args.rate) - len(missing)} book(s).")
+    else:
+        migrate_from_csv(BookStore(args.db), args.training_csv, args.processed_folder, args.reviews_folder,
+                         args.force)
@@ -0,0 +1,96 @@
+'''
+Integer encoding of categorical columns (Author, Genre) for the score model.
+
+Unlike sklearn's LabelEncoder, labels missing from the vocabulary do not need
+to be added before transforming: they map to a reserved unknown code. Lookups
+go through a hash index over the whole column at once, so encoding a large
+catalog costs the same however many of its authors are new. Labels added to
+the vocabulary later (extend) get new codes after the existing ones, so codes
+the model was trained on never change.
+'''
+
+# Code for labels not in the vocabulary; known labels are numbered from 1
+UNKNOWN_CODE = 0
+
+
+class CategoryEncoder:
+    """
+    Maps category labels to integer codes, with a reserved code for unknown labels.
+
+    Parameters:
+        vocabulary (list[str], optional): Known labels in code order (codes 1, 2, ...).
+    """
+
+    def __init__(self, vocabulary=None):
+        self.vocabulary = [str(label) for label in vocabulary] if vocabulary is not None else []
+        self._index = None
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def __contains__(self, label):
+        return self._get_index().get_indexer([str(label)])[0] >= 0
+
+    def __getstate__(self):
+        # The hash index is rebuilt on first use after loading
+        return {'vocabulary': self.vocabulary}
+
+    def __setstate__(self, state):
+        self.vocabulary = state['vocabulary']
+        self._index = None
+
+    @property
+    def classes_(self):
+        return list(self.vocabulary)
+
+    def _get_index(self):
+        import pandas as pd
+
+        if self._index is None:
+            self._index = pd.Index(self.vocabulary, dtype=object)
+        return self._index
+
+    @staticmethod
+    def _labels(values):
+        import pandas as pd
+
+        return pd.Series(values, dtype=object).astype(str)
+
+    def fit(self, values):
+        """Sets the vocabulary to the sorted distinct labels in values."""
+        self.vocabulary = sorted(self._labels(values).unique())
+        self._index = None
+        return self
+
+    def extend(self, values):
+        """
+        Adds labels not in the vocabulary yet, after the existing ones.
+
+        Returns:
+            int: Number of labels added.
+        """
+        labels = self._labels(values)
+        new_labels = sorted(labels[self._get_index().get_indexer(labels) < 0].unique())
+        if new_labels:
+            self.vocabulary = self.vocabulary + new_labels
+            self._index = None
+        return len(new_labels)
+
+    def transform(self, values):
+        """
+        Encodes a column of labels.
+
+        Returns:
+            numpy.ndarray: Codes for each label, UNKNOWN_CODE for labels not in the vocabulary.
+        """
+        return self._get_index().get_indexer(self._labels(values)) + 1
+
+    def fit_transform(self, values):
+        return self.fit(values).transform(values)
+
+    def inverse_transform(self, codes):
+        """Returns the label for each code, or None for the unknown code."""
+        return [self.vocabulary[code - 1] if code != UNKNOWN_CODE else None for code in codes]
+
+    def copy(self):
+        return CategoryEncoder(self.vocabulary)
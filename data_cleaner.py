@@ -1,39 +1,70 @@
 import os
-import pandas as pd
+import json
+import hashlib
+from urllib.parse import unquote
+
+# pandas is imported inside the functions below so that importing this module
+# (for example from the GUI at startup) does not pay for it up front.
+
+# The manifest of processed review files is stored in the folder of review files
+MANIFEST_FILENAME = '.review_manifest.json'
 
 def clean_text(text):
     """Cleans text by removing zero-width space characters."""
     return text.replace('\u200b', '').strip()
 
-def process_book_csv(file_path, master_df, author, genre):
-    """Processes a single book file and appends data to a master DataFrame."""
+def book_title_from_filename(filename):
+    """Extracts the book title from a review file name by removing "_reviews_sentiment" and cleaning it."""
+    return clean_text(os.path.basename(filename).replace('_reviews_sentiment', '').replace('.csv', ''))
+
+def csv_book_means(file_path):
+    """Returns the mean Ending and Journey scores of a review CSV, or None if it lacks the needed columns."""
+    import pandas as pd
+
     # Load the CSV file
     df = pd.read_csv(file_path)
 
     # Ensure necessary columns exist
     if not all(col in df.columns for col in ['Category', 'Confidence Score']):
         print(f"Skipping {file_path}: Missing required columns.")
-        return master_df
+        return None
 
     # Calculate average scores for each category
     ending_score = df[df['Category'] == 'Ending']['Confidence Score'].mean()
     journey_score = df[df['Category'] == 'Journey']['Confidence Score'].mean()
+    return ending_score, journey_score
+
+def process_book_csv(file_path, master_df, author, genre):
+    """Processes a single book file and appends data to a master DataFrame."""
+    means = csv_book_means(file_path)
+    if means is None:
+        return master_df
+    return add_book_scores(master_df, book_title_from_filename(file_path), *means, author, genre)
+
+def add_book_scores(master_df, book_title, ending_score, journey_score, author, genre, replace=False):
+    """
+    Adds a book's average Ending and Journey scores to the master DataFrame.
+
+    If the book is already present its row is left alone, or with replace=True
+    its scores are updated in place.
+    """
+    import pandas as pd
 
     # Handle cases where no reviews exist for a category
     ending_score = ending_score if pd.notna(ending_score) else 0
     journey_score = journey_score if pd.notna(journey_score) else 0
 
     # Multiply scores by 10 and round to hundredths place
-    ending_score = round(ending_score * 10, 2)
-    journey_score = round(journey_score * 10, 2)
-
-    # Extract the book title from the file name by removing "_reviews_sentiment" and cleaning it
-    original_name = os.path.basename(file_path)
-    book_title = clean_text(original_name.replace('_reviews_sentiment', '').replace('.csv', ''))
+    ending_score = round(float(ending_score) * 10, 2)
+    journey_score = round(float(journey_score) * 10, 2)
 
     # Check if the book already exists in the master DataFrame
-    if book_title in master_df['Book Title'].values:
-        print(f"Skipping duplicate entry for book: {book_title}")
+    existing = master_df['Book Title'] == book_title
+    if existing.any():
+        if replace:
+            master_df.loc[existing, ['Ending Score', 'Journey Score']] = [ending_score, journey_score]
+        else:
+            print(f"Skipping duplicate entry for book: {book_title}")
         return master_df
 
     # Create a new DataFrame with scores, the book title, genre, and author
@@ -50,8 +81,235 @@ def process_book_csv(file_path, master_df, author, genre):
     master_df = pd.concat([master_df, new_row], ignore_index=True)
     return master_df
 
+def normalize_title(title):
+    """Normalises a book title for duplicate detection (zero-width spaces, whitespace and case)."""
+    return ' '.join(clean_text(str(title)).split()).casefold()
+
+def load_review_scores(input_folder, sources):
+    """
+    Loads the Category and Confidence Score of every review in the given sources into one DataFrame.
+
+    Dataset books are read together in one dataset scan; CSV files are loaded
+    in parallel by review_loader and concatenated once.
+
+    Returns:
+        tuple: (DataFrame with book, Category and Confidence Score columns,
+        list of the book titles that could be loaded)
+    """
+    import pandas as pd
+
+    frames = []
+    loaded = []
+
+    dataset_books = [source['book'] for source in sources if source['kind'] == 'dataset']
+    if dataset_books:
+        from review_dataset import read_reviews
+        df = read_reviews(input_folder, columns=['book', 'Category', 'Confidence Score'], books=dataset_books)
+        df['book'] = df['book'].map(clean_text)
+        frames.append(df)
+        loaded.extend(dataset_books)
+
+    # CSV files are read in parallel with only the two needed columns and compact dtypes
+    csv_sources = [source for source in sources if source['kind'] == 'csv']
+    if csv_sources:
+        from review_loader import load_review_files
+        df, skipped = load_review_files([source['paths'][0] for source in csv_sources],
+                                        columns=['Category', 'Confidence Score'],
+                                        labels=[source['book'] for source in csv_sources])
+        for file_path in skipped:
+            print(f"Skipping {file_path}: Missing required columns.")
+        skipped = set(skipped)
+        frames.append(df)
+        loaded.extend(source['book'] for source in csv_sources if source['paths'][0] not in skipped)
+
+    if not frames:
+        return pd.DataFrame(columns=['book', 'Category', 'Confidence Score']), loaded
+    return pd.concat(frames, ignore_index=True), loaded
+
+def aggregate_book_scores(reviews, books=None):
+    """
+    Computes every book's Ending and Journey scores and review counts in one grouped operation.
+
+    Scores are the mean confidence score of the category multiplied by 10 and
+    rounded to hundredths, or 0 when a book has no reviews in that category.
+
+    Parameters:
+        reviews (DataFrame): book, Category and Confidence Score columns.
+        books (list[str]): Books to include even if they have no Ending or Journey reviews.
+
+    Returns:
+        DataFrame: Indexed by book, with Ending Score, Journey Score, Ending Count and Journey Count.
+    """
+    import pandas as pd
+
+    relevant = reviews[reviews['Category'].isin(['Ending', 'Journey'])]
+    if relevant.empty:
+        grouped = pd.DataFrame(index=pd.Index([], name='book'))
+    else:
+        grouped = relevant.groupby(['book', 'Category'], observed=True)['Confidence Score'].agg(['mean', 'count'])
+        grouped = grouped.unstack('Category')
+
+    scores = pd.DataFrame(index=grouped.index)
+    for category in ['Ending', 'Journey']:
+        means = grouped[('mean', category)] if ('mean', category) in grouped.columns else 0.0
+        counts = grouped[('count', category)] if ('count', category) in grouped.columns else 0
+        scores[f'{category} Score'] = (pd.Series(means, index=grouped.index, dtype='float64') * 10).round(2)
+        scores[f'{category} Count'] = pd.Series(counts, index=grouped.index).fillna(0).astype('int64')
+
+    if books is not None:
+        scores = scores.reindex(pd.Index(list(dict.fromkeys(books)), name='book'))
+
+    # Handle cases where no reviews exist for a category
+    return scores.fillna({'Ending Score': 0.0, 'Journey Score': 0.0, 'Ending Count': 0, 'Journey Count': 0}) \
+                 .astype({'Ending Count': 'int64', 'Journey Count': 'int64'})
+
+def upsert_book_scores(master_df, scores, author, genre, labels=None):
+    """
+    Adds or updates the scores of many books in the master DataFrame at once.
+
+    Existing books are found through a hash index on normalised titles and
+    have their scores updated in place; new books are appended in a single
+    concatenation, with their (author, genre) from labels when given there and
+    the given author and genre otherwise.
+    """
+    import numpy as np
+    import pandas as pd
+
+    master_df = master_df.reset_index(drop=True)
+    index = {}
+    for position, title in enumerate(master_df['Book Title']):
+        if pd.notna(title):
+            index.setdefault(normalize_title(title), position)
+
+    update_positions, update_values = [], []
+    new_rows = {}
+    for book_title, ending_score, journey_score in zip(scores.index, scores['Ending Score'], scores['Journey Score']):
+        key = normalize_title(book_title)
+        if key in index:
+            update_positions.append(index[key])
+            update_values.append((ending_score, journey_score))
+        else:
+            book_author, book_genre = (labels or {}).get(book_title, (None, None))
+            new_rows[key] = (book_title, book_author if book_author is not None else author,
+                             book_genre if book_genre is not None else genre, ending_score, journey_score)
+
+    if update_positions:
+        master_df.loc[update_positions, ['Ending Score', 'Journey Score']] = np.array(update_values, dtype='float64')
+
+    if new_rows:
+        titles, authors, genres, ending_scores, journey_scores = zip(*new_rows.values())
+        new_df = pd.DataFrame({
+            'Book Title': titles,
+            'Author': authors,
+            'Genre': genres,
+            'Ending Score': ending_scores,
+            'Journey Score': journey_scores,
+        })
+        master_df = pd.concat([master_df, new_df], ignore_index=True)
+    return master_df
+
+def list_review_sources(input_folder):
+    """
+    Lists the review files in a folder, grouped per book.
+
+    A book stored in the Parquet review dataset is one source made of its
+    partition's files; its CSV file, if any, is then ignored. Every other
+    review CSV is a source of its own.
+
+    Returns:
+        dict: Maps a source key to {'kind': 'dataset' or 'csv', 'book': title, 'paths': [file paths]}.
+    """
+    from review_dataset import dataset_path, has_dataset, PARTITION_COLUMN
+
+    sources = {}
+    dataset_books = set()
+    if has_dataset(input_folder):
+        root = dataset_path(input_folder)
+        prefix = f"{PARTITION_COLUMN}="
+        for folder in sorted(os.listdir(root)):
+            if not folder.startswith(prefix):
+                continue
+            paths = sorted(os.path.join(root, folder, name) for name in os.listdir(os.path.join(root, folder))
+                           if name.endswith('.parquet') and not name.startswith('.'))
+            if paths:
+                book_title = clean_text(unquote(folder[len(prefix):]))
+                dataset_books.add(book_title)
+                sources[os.path.join(os.path.basename(root), folder)] = {
+                    'kind': 'dataset', 'book': book_title, 'paths': paths}
+
+    for filename in sorted(os.listdir(input_folder)):
+        if filename.endswith('.csv'):  # Only process CSV files
+            book_title = book_title_from_filename(filename)
+            if book_title not in dataset_books:
+                sources[filename] = {'kind': 'csv', 'book': book_title,
+                                     'paths': [os.path.join(input_folder, filename)]}
+    return sources
+
+def _file_stats(paths):
+    # Total size and newest modification time of a source's files
+    stats = [os.stat(path) for path in paths]
+    return sum(stat.st_size for stat in stats), max(stat.st_mtime_ns for stat in stats)
+
+def _content_hash(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path):
+    """Loads the manifest of processed review files, or an empty one."""
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, encoding='utf-8') as file:
+        return json.load(file)
+
+def save_manifest(manifest_path, manifest):
+    """Saves the manifest, replacing the old file only once the new one is fully written."""
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+def manifest_path(input_folder):
+    """Returns the path of the manifest for a folder of review files."""
+    return os.path.join(input_folder, MANIFEST_FILENAME)
+
+def stored_book_scores(manifest):
+    """Returns the scores recorded in the manifest, in the layout of aggregate_book_scores."""
+    import pandas as pd
+
+    entries = [entry for entry in manifest.values() if not entry.get('skipped')]
+    scores = pd.DataFrame({
+        'Ending Score': [entry['ending_score'] for entry in entries],
+        'Journey Score': [entry['journey_score'] for entry in entries],
+        'Ending Count': [entry['ending_count'] for entry in entries],
+        'Journey Count': [entry['journey_count'] for entry in entries],
+    }, index=pd.Index([entry['book'] for entry in entries], name='book'))
+    return scores.astype({'Ending Count': 'int64', 'Journey Count': 'int64'})
+
 def process_all_books(input_folder, output_file, author, genre):
-    """Processes all book files in a folder and saves the combined data."""
+    """
+    Processes the book files in a folder and saves the combined data.
+
+    A manifest in the input folder records the size, modification time,
+    content hash and resulting scores of every processed review file. Only new
+    or changed files are read again; the rows of unchanged books are built from
+    the scores stored in the manifest, so writing a new output file does not
+    re-read the library. A changed file updates its book's existing row in
+    place, and files without the needed columns are recorded as skipped. When
+    nothing has changed and the output file already holds every book, it is
+    left untouched.
+
+    The reviews of all new or changed files are loaded together and aggregated
+    in a single grouped operation, and the output is written once.
+    """
+    import pandas as pd
+
+    manifest_file = manifest_path(input_folder)
+    manifest = load_manifest(manifest_file)
+
     # Check if the output file already exists and load it
     if os.path.exists(output_file):
         master_df = pd.read_csv(output_file)
@@ -59,11 +317,67 @@ def process_all_books(input_folder, output_file, author, genre):
         # Create an empty DataFrame to store all processed data
         master_df = pd.DataFrame(columns=['Book Title', 'Author', 'Genre', 'Ending Score', 'Journey Score', 'My Score'])
 
-    # Loop through all CSV files in the input folder
-    for filename in os.listdir(input_folder):
-        if filename.endswith('.csv'):  # Only process CSV files
-            file_path = os.path.join(input_folder, filename)
-            master_df = process_book_csv(file_path, master_df, author, genre)
+    sources = list_review_sources(input_folder)
+
+    # Forget files that no longer exist; their books stay in the output
+    manifest_changed = any(key not in sources for key in manifest)
+    manifest = {key: entry for key, entry in manifest.items() if key in sources}
+
+    # Find new or changed files: compare size and mtime first, and hash only when they differ
+    changed = {}
+    for key, source in sources.items():
+        size, mtime = _file_stats(source['paths'])
+        entry = manifest.get(key)
+        if entry and entry['size'] == size and entry['mtime'] == mtime:
+            continue
+        content_hash = _content_hash(source['paths'])
+        if entry and entry['hash'] == content_hash:
+            # Touched but not modified
+            entry.update(size=size, mtime=mtime)
+            manifest_changed = True
+            continue
+        changed[key] = dict(source, size=size, mtime=mtime, hash=content_hash)
+
+    known_books = set(master_df['Book Title'].dropna().map(normalize_title))
+    missing_rows = any(normalize_title(entry['book']) not in known_books
+                       for entry in manifest.values() if not entry.get('skipped'))
+    if not changed and not manifest_changed and not missing_rows and os.path.exists(output_file):
+        print(f"No new or changed review files; {output_file} is up to date.")
+        return
+
+    # Load every changed book's reviews at once and aggregate them in one grouped operation
+    reviews, loaded_books = load_review_scores(input_folder, list(changed.values()))
+    scores = aggregate_book_scores(reviews, books=loaded_books)
+
+    for key, source in changed.items():
+        entry = {
+            'paths': [os.path.relpath(path, input_folder) for path in source['paths']],
+            'book': source['book'],
+            'size': source['size'],
+            'mtime': source['mtime'],
+            'hash': source['hash'],
+        }
+        if source['book'] in scores.index:
+            book_scores = scores.loc[source['book']]
+            entry.update(ending_score=float(book_scores['Ending Score']),
+                         journey_score=float(book_scores['Journey Score']),
+                         ending_count=int(book_scores['Ending Count']),
+                         journey_count=int(book_scores['Journey Count']))
+        else:
+            # Missing required columns; not read again until the file changes
+            entry['skipped'] = True
+        manifest[key] = entry
+
+    # Unchanged books missing from the output come from the scores stored in the manifest
+    stored = stored_book_scores({key: entry for key, entry in manifest.items() if key not in changed})
+    stored = stored[~stored.index.map(normalize_title).isin(known_books)]
+    all_scores = pd.concat([stored, scores])
+
+    # Books the store already knows keep their author and genre; the given ones are for newly scraped books
+    from book_store import get_book_store
+    store = get_book_store()
+    new_titles = [title for title in all_scores.index if normalize_title(title) not in known_books]
+    master_df = upsert_book_scores(master_df, all_scores, author, genre, labels=store.book_labels(new_titles))
 
     # Remove rows where 'Book Title' is null
     master_df = master_df[master_df['Book Title'].notna()]
@@ -73,5 +387,17 @@ def process_all_books(input_folder, output_file, author, genre):
 
     # Save the sorted DataFrame to a single CSV file
     master_df.to_csv(output_file, index=False)
+    save_manifest(manifest_file, manifest)
+
+    # Upsert the new or changed books into the book store as well
+    changed_keys = {normalize_title(book) for book in scores.index}
+    changed_rows = master_df[master_df['Book Title'].map(normalize_title).isin(changed_keys)]
+    store.upsert_books(changed_rows.to_dict('records'))
+
+    print(f"All data combined, sorted, and saved to: {output_file} ({len(changed)} new or changed review files)")
 
-    print(f"All data combined, sorted, and saved to: {output_file}")
\ No newline at end of file
+def rebuild_master(input_folder, output_file, author, genre):
+    """Rebuilds the output file from every review file in the folder, ignoring the manifest."""
+    if os.path.exists(manifest_path(input_folder)):
+        os.remove(manifest_path(input_folder))
+    process_all_books(input_folder, output_file, author, genre)
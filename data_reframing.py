@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+from review_loader import read_review_file
 
 # Function to clean text by removing zero-width space characters
 def clean_text(text):
@@ -7,11 +8,11 @@ def clean_text(text):
 
 # Function to process each book file and append data to a master DataFrame
 def process_book_csv(file_path, master_df):
-    # Load the CSV file
-    df = pd.read_csv(file_path)
-
-    # Ensure necessary columns exist
-    if not all(col in df.columns for col in ['Category', 'Confidence Score']):
+    # Load only the needed columns of the CSV file, with compact dtypes
+    try:
+        df = read_review_file(file_path, columns=['Category', 'Confidence Score'])
+    except (ValueError, KeyError):
+        # Ensure necessary columns exist
         print(f"Skipping {file_path}: Missing required columns.")
         return master_df
 
@@ -0,0 +1,147 @@
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+'''
+A pool of warm headless Chrome sessions shared across scrapes.
+
+Starting ChromeDriver and a browser costs several seconds, often more than
+loading the page itself, so sessions are kept open and handed out again.
+A session is checked before it is reused, is replaced when it fails, and is
+recycled after a fixed number of pages to keep browser memory in check.
+'''
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES = 25
+PAGE_LOAD_TIMEOUT = 120
+
+
+@lru_cache(maxsize=None)
+def resolve_driver_path():
+    """Resolves (downloading if needed) the ChromeDriver binary once per process."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def create_driver():
+    """Starts a new headless Chrome session."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    # Set up Selenium WebDriver with options
+    options = Options()
+    options.page_load_strategy = 'normal'
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+
+    service = Service(resolve_driver_path())
+    driver = webdriver.Chrome(service=service, options=options)
+
+    # Set timeouts
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class WebDriverPool:
+    """
+    Hands out reusable browser sessions.
+
+    Parameters:
+        size (int): Maximum number of browser sessions open at once.
+        max_pages (int): Pages a session may load before it is replaced.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES):
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()  # Most recently used session first
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    @staticmethod
+    def _is_healthy(session):
+        try:
+            session.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self):
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                return _Session(create_driver())
+            if self._is_healthy(session):
+                return session
+            _quit_quietly(session.driver)
+
+    @contextmanager
+    def session(self):
+        """
+        Borrow a browser for loading one page.
+
+        A session that raises inside the block is discarded rather than
+        returned, since the browser may be left in an unknown state.
+        """
+        if self._closed:
+            raise RuntimeError("The WebDriver pool has been closed.")
+
+        self._slots.acquire()
+        session = None
+        try:
+            session = self._checkout()
+            yield session.driver
+            session.pages += 1
+            if session.pages >= self.max_pages or self._closed:
+                _quit_quietly(session.driver)
+            else:
+                self._idle.put(session)
+        except BaseException:
+            if session is not None:
+                _quit_quietly(session.driver)
+            raise
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Quits every idle browser and stops handing out new sessions."""
+        self._closed = True
+        while True:
+            try:
+                _quit_quietly(self._idle.get_nowait().driver)
+            except queue.Empty:
+                break
+
+
+# Process-wide pool, created on first use
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Returns the shared WebDriver pool, creating it on the first call."""
+    global _driver_pool
+    if _driver_pool is None:
+        with _driver_pool_lock:
+            if _driver_pool is None:
+                _driver_pool = WebDriverPool()
+                atexit.register(_driver_pool.close)
+    return _driver_pool
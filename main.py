@@ -1,13 +1,10 @@
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
-import numpy as np
-from ScrapeSentiment_Function import scrape_goodreads  # Replace with actual file name containing scraping logic
-from data_cleaner import process_all_books  # Replace with actual file name for data cleaning
-from model_b import predict_and_update_csv  # Replace with actual file name for prediction and updates
+
+# Scraping, sentiment, modelling and plotting libraries are imported inside the
+# functions that use them so the window appears without waiting for selenium,
+# transformers, scikit-learn or matplotlib to load.
 
 # Initialize the main GUI window
 root = tk.Tk()
@@ -21,6 +18,10 @@ predicted_score_var = tk.DoubleVar()
 
 # Function to run the entire workflow from scraping to prediction
 def run_workflow():
+    from ScrapeSentiment_Function import scrape_goodreads  # Replace with actual file name containing scraping logic
+    from data_cleaner import process_all_books  # Replace with actual file name for data cleaning
+    from model_b import predict_and_update_csv  # Replace with actual file name for prediction and updates
+
     # Collect user inputs from the GUI
     url = url_entry.get()
     book_title = book_title_entry.get()
@@ -71,6 +72,9 @@ def display_results(df, book_title):
 
 # Function to create a needle visualization for a score
 def create_needle(score, title, ax):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     theta = np.linspace(0, np.pi, 100)
     x = np.cos(theta)
     y = np.sin(theta)
@@ -107,6 +111,9 @@ def create_needle(score, title, ax):
 
 # Function to plot two needle visualizations
 def plot_needles(ending_score, journey_score):
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
     fig, axes = plt.subplots(1, 2, figsize=(10, 5))
 
     # Plot for Ending Score
@@ -165,4 +172,5 @@ canvas_frame = tk.Frame(output_frame)
 canvas_frame.pack(fill="both", expand=True)
 
 # Run the GUI application
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    root.mainloop()
@@ -0,0 +1,187 @@
+import os
+import time
+import json
+import hashlib
+import argparse
+
+'''
+Parallel cross-validation and hyperparameter search for the score model.
+
+Every (configuration, fold) pair is an independent job run across the CPU
+cores with joblib. Fold splits are computed once per training data and kept
+in cache/folds/, so repeated searches over the same books compare
+configurations on identical folds. Each configuration's mean accuracy, fit
+time and per-book prediction latency are written to a results table.
+
+Usage:
+    python model_search.py --folds 5 --jobs -1 --output model_search_results.csv
+    python model_search.py --grid '{"n_estimators": [100, 300], "max_depth": [null, 8]}'
+'''
+
+DEFAULT_FOLD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'folds')
+DEFAULT_FOLDS = 5
+DEFAULT_SEED = 42
+
+# Random forest settings searched when no grid is given
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [100, 300],
+    'max_depth': [None, 8, 16],
+    'min_samples_leaf': [1, 3],
+    'max_features': ['sqrt', None],
+}
+
+
+def fold_splits(training_df, folds=DEFAULT_FOLDS, seed=DEFAULT_SEED, folder=DEFAULT_FOLD_FOLDER):
+    """
+    Returns k-fold (train, test) row positions for the training data, cached on disk.
+
+    Folds are stratified by score when every score has at least `folds` books,
+    and plain shuffled folds otherwise. The cache key covers the rows in their
+    order, since the cached folds are row positions.
+
+    Returns:
+        list[tuple[numpy.ndarray, numpy.ndarray]]: Train and test positions for each fold.
+    """
+    import numpy as np
+    from sklearn.model_selection import KFold, StratifiedKFold
+    from model_b import FEATURE_COLUMNS, TARGET_COLUMN
+    from model_store import row_hashes
+
+    digest = hashlib.sha256(row_hashes(training_df, FEATURE_COLUMNS + [TARGET_COLUMN]).tobytes())
+    path = os.path.join(folder, f"{digest.hexdigest()[:16]}_k{folds}_s{seed}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return [(cached[f"train_{i}"], cached[f"test_{i}"]) for i in range(folds)]
+
+    y = training_df[TARGET_COLUMN].to_numpy()
+    if training_df[TARGET_COLUMN].value_counts().min() >= folds:
+        splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    else:
+        splitter = KFold(n_splits=folds, shuffle=True, random_state=seed)
+    splits = list(splitter.split(np.zeros(len(y)), y))
+
+    os.makedirs(folder, exist_ok=True)
+    arrays = {}
+    for i, (train_positions, test_positions) in enumerate(splits):
+        arrays[f"train_{i}"] = train_positions
+        arrays[f"test_{i}"] = test_positions
+    np.savez(f"{path}.tmp.npz", **arrays)
+    os.replace(f"{path}.tmp.npz", path)
+    return splits
+
+
+def evaluate_fold(training_df, train_positions, test_positions, params, seed=DEFAULT_SEED):
+    """
+    Trains a random forest with the given settings on one fold and scores it on the held-out rows.
+
+    Returns:
+        dict: Accuracy, fit time in seconds and prediction latency in milliseconds per book.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from category_encoder import CategoryEncoder
+    from model_b import FEATURE_COLUMNS, TARGET_COLUMN
+
+    train_df = training_df.iloc[train_positions]
+    test_df = training_df.iloc[test_positions]
+
+    # Encoders are fitted on the training fold only, as they would be in production
+    X_train = train_df[FEATURE_COLUMNS].copy()
+    X_test = test_df[FEATURE_COLUMNS].copy()
+    for column in ("Author", "Genre"):
+        encoder = CategoryEncoder().fit(X_train[column])
+        X_train[column] = encoder.transform(X_train[column])
+        X_test[column] = encoder.transform(X_test[column])
+
+    # One core per job; the parallelism is across jobs
+    model = RandomForestClassifier(random_state=seed, n_jobs=1, **params)
+    start = time.perf_counter()
+    model.fit(X_train, train_df[TARGET_COLUMN])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        'accuracy': float((predictions == test_df[TARGET_COLUMN].to_numpy()).mean()),
+        'fit_seconds': fit_seconds,
+        'predict_ms_per_book': 1000 * predict_seconds / max(len(test_df), 1),
+    }
+
+
+def search(training_df, param_grid=None, folds=DEFAULT_FOLDS, n_jobs=-1, samples=None, seed=DEFAULT_SEED,
+           fold_folder=DEFAULT_FOLD_FOLDER):
+    """
+    Cross-validates every configuration in the grid in parallel.
+
+    Parameters:
+        training_df (DataFrame): Rated books with the model's feature and target columns.
+        param_grid (dict, optional): RandomForestClassifier settings to search; defaults to DEFAULT_PARAM_GRID.
+        folds (int): Number of cross-validation folds.
+        n_jobs (int): joblib workers; -1 uses every core.
+        samples (int, optional): Try this many random configurations from the grid instead of all of them.
+        seed (int): Seed for the folds, the forests and the random sampling.
+        fold_folder (str): Folder caching the fold splits.
+
+    Returns:
+        DataFrame: One row per configuration, best mean accuracy first.
+    """
+    import pandas as pd
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+    param_grid = param_grid or DEFAULT_PARAM_GRID
+    if samples:
+        configs = list(ParameterSampler(param_grid, n_iter=samples, random_state=seed))
+    else:
+        configs = list(ParameterGrid(param_grid))
+
+    training_df = training_df.reset_index(drop=True)
+    splits = fold_splits(training_df, folds, seed, fold_folder)
+
+    jobs = [(config_id, fold, params, train_positions, test_positions)
+            for config_id, params in enumerate(configs)
+            for fold, (train_positions, test_positions) in enumerate(splits)]
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_fold)(training_df, train_positions, test_positions, params, seed)
+        for _, _, params, train_positions, test_positions in jobs)
+
+    fold_results = pd.DataFrame([dict(score, config=config_id, fold=fold)
+                                 for (config_id, fold, _, _, _), score in zip(jobs, scores)])
+    summary = fold_results.groupby('config').agg(
+        accuracy=('accuracy', 'mean'),
+        accuracy_std=('accuracy', 'std'),
+        fit_seconds=('fit_seconds', 'mean'),
+        predict_ms_per_book=('predict_ms_per_book', 'mean'),
+    )
+    summary['params'] = [json.dumps(configs[config_id], sort_keys=True) for config_id in summary.index]
+    return summary.sort_values(['accuracy', 'fit_seconds'], ascending=[False, True]).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validate random forest settings for the score model.")
+    parser.add_argument('--csv', help="Training CSV; defaults to the rated books model_b trains on.")
+    parser.add_argument('--grid', help="JSON object of RandomForestClassifier settings to search.")
+    parser.add_argument('--samples', type=int, help="Try this many random configurations instead of the full grid.")
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS)
+    parser.add_argument('--jobs', type=int, default=-1, help="Parallel jobs; -1 uses every core.")
+    parser.add_argument('--output', default='model_search_results.csv')
+    args = parser.parse_args()
+
+    import pandas as pd
+    from model_b import load_training_data
+
+    training_df = pd.read_csv(args.csv) if args.csv else load_training_data()
+    param_grid = json.loads(args.grid) if args.grid else None
+
+    start = time.perf_counter()
+    results = search(training_df, param_grid, folds=args.folds, n_jobs=args.jobs, samples=args.samples)
+    results.to_csv(args.output, index=False)
+
+    print(results.head(10).to_string(index=False))
+    print(f"{len(results)} configurations x {args.folds} folds in {time.perf_counter() - start:.1f}s; "
+          f"results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+
+'''
+Versioned, persisted model artifacts.
+
+A trained model is saved together with everything needed to use it (label
+encoders, feature columns) as one joblib file in a folder named after a hash
+of the training data. A model is only trained again when the training data,
+and so its hash, changes, and the last versions loaded stay in memory.
+
+Artifacts are loaded with mmap_mode='r', but only plain numpy arrays such
+as the row hashes are memory-mapped: scikit-learn's trees copy their node
+arrays into memory when unpickled, so a loaded forest is fully in RAM.
+
+When the new training data only adds rows to the data of the latest version,
+the model can be updated from that version instead of retrained, with a full
+rebuild after a fixed number of updates in a row.
+'''
+
+DEFAULT_MODEL_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'random_forest')
+ARTIFACT_FILENAME = 'model.joblib'
+INDEX_FILENAME = 'versions.json'
+
+# Number of artifact versions kept on disk
+DEFAULT_KEEP_VERSIONS = 5
+
+# Incremental updates allowed in a row before the model is rebuilt from scratch
+DEFAULT_REBUILD_EVERY = 10
+
+# Artifacts loaded in this process are kept for the most recently used versions;
+# older ones are dropped so that retraining does not pile up forests in memory
+LOADED_VERSIONS = 2
+
+# Artifacts already loaded in this process, by folder and version, least recently used first
+_loaded = OrderedDict()
+_loaded_lock = threading.Lock()
+
+
+def row_hashes(training_df, columns):
+    """Returns a 64-bit hash of each training row over the given columns, in row order."""
+    import pandas as pd
+
+    return pd.util.hash_pandas_object(training_df[list(columns)], index=False).to_numpy()
+
+
+def training_data_hash(training_df, columns, hashes=None, model_format=None):
+    """
+    Hashes the given columns of the training data, ignoring row order.
+
+    model_format, if given, is included so that a change to how models are
+    built or encoded does not reuse artifacts saved in the old format.
+
+    Returns:
+        str: Hex SHA-256 digest identifying this training data.
+    """
+    if hashes is None:
+        hashes = row_hashes(training_df, columns)
+    hashes = hashes.copy()
+    hashes.sort()
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([list(columns), model_format]).encode('utf-8'))
+    digest.update(hashes.tobytes())
+    return digest.hexdigest()
+
+
+def version_name(data_hash):
+    """Returns the short version name used for an artifact's folder."""
+    return data_hash[:16]
+
+
+def _artifact_path(folder, version):
+    return os.path.join(folder, version, ARTIFACT_FILENAME)
+
+
+def _read_index(folder):
+    path = os.path.join(folder, INDEX_FILENAME)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def _write_index(folder, index):
+    path = os.path.join(folder, INDEX_FILENAME)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+        json.dump(index, file, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def save_artifact(artifact, data_hash, folder=DEFAULT_MODEL_FOLDER, keep_versions=DEFAULT_KEEP_VERSIONS):
+    """
+    Saves an artifact (a dict holding the model and its metadata) as a new version.
+
+    Returns:
+        str: The version name.
+    """
+    import joblib
+
+    version = version_name(data_hash)
+    path = _artifact_path(folder, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Uncompressed so that the plain arrays (the row hashes) can be memory-mapped on load
+    joblib.dump(artifact, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+    index = [entry for entry in _read_index(folder) if entry['version'] != version]
+    index.append({'version': version, 'data_hash': data_hash, 'saved_at': time.time(),
+                  'rows': artifact.get('rows'), 'features': artifact.get('features'),
+                  'updates': artifact.get('updates', 0), 'base_version': artifact.get('base_version')})
+
+    # Drop the oldest versions beyond the limit
+    for entry in index[:-keep_versions]:
+        shutil.rmtree(os.path.join(folder, entry['version']), ignore_errors=True)
+    _write_index(folder, index[-keep_versions:])
+    return version
+
+
+def load_artifact(data_hash, folder=DEFAULT_MODEL_FOLDER):
+    """Loads the artifact trained on data with this hash, or returns None if there is none."""
+    return _load_version(version_name(data_hash), folder)
+
+
+def latest_artifact(folder=DEFAULT_MODEL_FOLDER):
+    """Loads the most recently saved artifact, or returns None if there is none."""
+    index = _read_index(folder)
+    if not index:
+        return None
+    return _load_version(index[-1]['version'], folder)
+
+
+def _load_version(version, folder):
+    import joblib
+
+    key = (folder, version)
+    with _loaded_lock:
+        if key in _loaded:
+            _loaded.move_to_end(key)
+            return _loaded[key]
+
+    path = _artifact_path(folder, version)
+    if not os.path.exists(path):
+        return None
+    artifact = joblib.load(path, mmap_mode='r')
+    _remember(key, artifact)
+    return artifact
+
+
+def _remember(key, artifact):
+    with _loaded_lock:
+        _loaded[key] = artifact
+        _loaded.move_to_end(key)
+        while len(_loaded) > LOADED_VERSIONS:
+            _loaded.popitem(last=False)
+
+
+def _update_from_latest(training_df, hashes, update, folder, rebuild_every, model_format):
+    """Updates the latest artifact with the rows it was not trained on, or returns None if it cannot."""
+    import numpy as np
+
+    base = latest_artifact(folder)
+    if (base is None or 'row_hashes' not in base or base.get('model_format') != model_format
+            or base.get('updates', 0) >= rebuild_every):
+        return None
+
+    # Only rows added since the base version can be learned incrementally;
+    # changed or removed rows need a rebuild
+    seen = np.isin(hashes, base['row_hashes'])
+    if seen.all() or not np.isin(base['row_hashes'], hashes).all():
+        return None
+
+    artifact = update(base, training_df, training_df[~seen])
+    if artifact is None:
+        return None
+    artifact['updates'] = base.get('updates', 0) + 1
+    artifact['base_version'] = base['version']
+    return artifact
+
+
+def get_or_train(training_df, columns, train, update=None, folder=DEFAULT_MODEL_FOLDER,
+                 rebuild_every=DEFAULT_REBUILD_EVERY, model_format=None):
+    """
+    Returns the artifact for this training data, training and saving it only if needed.
+
+    Parameters:
+        training_df (DataFrame): Training data.
+        columns (list[str]): Columns the model depends on (features and target).
+        train (callable): train(training_df) -> artifact dict.
+        update (callable, optional): update(base_artifact, training_df, new_rows) -> artifact dict,
+            or None when the new rows cannot be learned incrementally. Without it every change
+            to the training data is a full retrain.
+        folder (str): Folder holding the artifact versions.
+        rebuild_every (int): Incremental updates allowed in a row before a full retrain.
+        model_format (str, optional): Version of the training code; artifacts saved with
+            another format are neither reused nor updated.
+
+    Returns:
+        dict: The artifact, with its "version" filled in.
+    """
+    hashes = row_hashes(training_df, columns)
+    data_hash = training_data_hash(training_df, columns, hashes, model_format)
+    artifact = load_artifact(data_hash, folder)
+    if artifact is not None:
+        return artifact
+
+    artifact = None
+    if update is not None:
+        artifact = _update_from_latest(training_df, hashes, update, folder, rebuild_every, model_format)
+    if artifact is None:
+        artifact = train(training_df)
+        artifact['updates'] = 0
+
+    artifact['model_format'] = model_format
+    artifact['row_hashes'] = hashes
+    artifact['data_hash'] = data_hash
+    artifact['version'] = version_name(data_hash)
+    artifact['trained_at'] = time.time()
+    save_artifact(artifact, data_hash, folder)
+
+    _remember((folder, artifact['version']), artifact)
+    return artifact
@@ -0,0 +1,151 @@
+import threading
+import functools
+import importlib.util
+from collections import namedtuple
+
+'''
+Fetch Goodreads book pages, preferring plain HTTP over a browser.
+
+Goodreads usually includes the review HTML in the server response, so a page
+is first requested with a pooled keep-alive HTTP session. The browser (from
+the shared WebDriver pool) is only used when the response has no review
+sections, for example when the reviews are rendered by JavaScript.
+
+The HTTP path takes any requests-compatible session, so it can be pointed at a
+local HTTP server serving saved Goodreads pages.
+
+Fetched pages are saved to the snapshot store with save_snapshot, which every
+fetch path uses, and a caller can accept a recent enough snapshot instead of
+fetching the page again.
+'''
+
+# Class on the element that wraps each review's text
+REVIEW_SECTION_CLASS = 'ReviewText__content'
+
+HTTP_TIMEOUT = 20
+HTTP_POOL_SIZE = 10
+
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# html: page source, source: "http", "selenium" or "snapshot"
+FetchedPage = namedtuple('FetchedPage', ['url', 'html', 'source'])
+
+# Process-wide HTTP session, created on first use
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Returns the shared keep-alive HTTP session, creating it on the first call."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _http_session = session
+    return _http_session
+
+
+def has_review_sections(html):
+    """Checks whether a page's HTML already contains review sections."""
+    return REVIEW_SECTION_CLASS in html
+
+
+@functools.lru_cache(maxsize=None)
+def snapshots_available():
+    """Checks whether zstandard, which the snapshot store needs, is installed."""
+    return importlib.util.find_spec('zstandard') is not None
+
+
+def save_snapshot(url, html, source):
+    """
+    Keep a fetched page in the snapshot store so its reviews can be replayed later.
+
+    Returns:
+        Snapshot or None: The stored snapshot, or None when zstandard is not installed.
+    """
+    if not snapshots_available():
+        return None
+    from snapshot_store import get_snapshot_store
+    return get_snapshot_store().save(url, html, source)
+
+
+def fetch_with_http(url, session=None):
+    """
+    Fetch a page over HTTP.
+
+    Returns:
+        str or None: The page HTML, or None if the request failed or the page
+        has no review sections.
+    """
+    import requests
+
+    session = session or get_http_session()
+    try:
+        response = session.get(url, timeout=HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200 or not has_review_sections(response.text):
+        return None
+    return response.text
+
+
+def fetch_with_browser(url):
+    """Fetch a page with a browser session from the shared WebDriver pool."""
+    from selenium.common.exceptions import TimeoutException
+    from driver_pool import get_driver_pool
+
+    with get_driver_pool().session() as driver:
+        try:
+            driver.get(url)
+        except TimeoutException:
+            raise TimeoutException("The page took too long to load. Try again later.")
+        return driver.page_source
+
+
+def fetch_page(url, session=None, browser_fallback=True, max_age=None, snapshot=True):
+    """
+    Fetch a Goodreads page over HTTP, falling back to Selenium if needed.
+
+    Parameters:
+        url (str): The Goodreads page URL.
+        session: requests-compatible session for the HTTP attempt (defaults to
+            the shared keep-alive session).
+        browser_fallback (bool): Whether to load the page in a browser when the
+            HTTP response has no review sections.
+        max_age (float): If given, return the stored snapshot of the page when
+            it is at most this many seconds old instead of fetching it.
+        snapshot (bool): Whether to keep the fetched page in the snapshot store.
+
+    Returns:
+        FetchedPage: The page HTML and which path produced it.
+    """
+    if max_age is not None and snapshots_available():
+        from snapshot_store import get_snapshot_store
+        html = get_snapshot_store().get_fresh(url, max_age)
+        if html is not None:
+            return FetchedPage(url, html, 'snapshot')
+
+    html = fetch_with_http(url, session)
+    if html is not None:
+        page = FetchedPage(url, html, 'http')
+    elif not browser_fallback:
+        raise ValueError("No reviews found in the HTTP response for the provided page.")
+    else:
+        page = FetchedPage(url, fetch_with_browser(url), 'selenium')
+
+    if snapshot:
+        save_snapshot(url, page.html, page.source)
+    return page
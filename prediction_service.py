@@ -0,0 +1,395 @@
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+import http.client
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+'''
+Long-lived local service that keeps the models loaded between runs.
+
+The service loads the sentiment pipeline, the keyword classifier and the
+score model once and answers JSON requests over HTTP on localhost:
+
+    GET  /health    status, model version and request counts
+    POST /score     {"reviews": [...]} -> {"categories": [...], "sentiments": [[label, score], ...]}
+    POST /predict   {"books": [{"Book Title", "Ending Score", "Journey Score", "Author", "Genre"}, ...]}
+                    -> {"predictions": [...], "model_version": "..."}
+    POST /reload    reloads the score model now
+
+/predict checks the training data hash on every batch and loads the model
+again when books have been rated since, so predictions match what model_b
+would produce without the service.
+
+Requests arriving together from several callers are merged into one batch
+(see MicroBatcher) so the model runs once per batch rather than once per call.
+
+Other tools use the service through ServiceClient when it is running and
+fall back to loading the models themselves when it is not:
+
+    python prediction_service.py serve
+    python prediction_service.py status
+'''
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = int(os.environ.get('BOOK_AI_SERVICE_PORT', 8765))
+
+# How long a batch waits for more requests after the first one, in seconds
+DEFAULT_MAX_WAIT = 0.01
+DEFAULT_MAX_BATCH = 256
+
+# Timeout for the health check clients use to find the service
+PROBE_TIMEOUT = 0.25
+
+
+class MicroBatcher:
+    """
+    Merges items submitted by concurrent callers into shared batches.
+
+    A worker thread takes the first waiting request, collects further requests
+    for up to max_wait seconds or until max_batch items are gathered, calls
+    process once on all of their items, and hands each caller its slice of the
+    results.
+
+    Parameters:
+        process (callable): process(items) -> list of results in the same order.
+        max_batch (int): Items after which a batch is run without waiting longer.
+        max_wait (float): Seconds to wait for more requests after the first one.
+    """
+
+    def __init__(self, process, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT, name='batcher'):
+        self.process = process
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, items):
+        """Processes the items as part of a shared batch and returns their results."""
+        items = list(items)
+        if not items:
+            return []
+        future = Future()
+        self._queue.put((items, future))
+        return future.result()
+
+    def _collect(self, first):
+        pending = [first]
+        count = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Stop after this batch
+                self._queue.put(None)
+                break
+            pending.append(request)
+            count += len(request[0])
+        return pending
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            pending = self._collect(first)
+            items = [item for request_items, _ in pending for item in request_items]
+            try:
+                results = self.process(items)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            offset = 0
+            for request_items, future in pending:
+                future.set_result(results[offset:offset + len(request_items)])
+                offset += len(request_items)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+class PredictionService:
+    """
+    The warm models behind the HTTP endpoints.
+
+    Parameters:
+        backend (str, optional): Sentiment inference backend (see ScrapeSentiment_Function).
+        max_batch (int): Largest micro-batch.
+        max_wait (float): Seconds a micro-batch waits for more requests.
+    """
+
+    def __init__(self, backend=None, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT):
+        self.backend = backend
+        self.started_at = time.time()
+        self._artifact = None
+        self._artifact_lock = threading.Lock()
+        self.review_batcher = MicroBatcher(self._score_reviews, max_batch, max_wait, name='review-batcher')
+        self.book_batcher = MicroBatcher(self._predict_books, max_batch, max_wait, name='book-batcher')
+
+    def warm_up(self):
+        """Loads every model now rather than on the first request."""
+        from ScrapeSentiment_Function import get_sentiment_analyzer
+        get_sentiment_analyzer(self.backend)
+        self.reload_model()
+
+    def reload_model(self):
+        """Loads the score model for the current training data and returns its version."""
+        from model_b import load_model
+        artifact = load_model()
+        with self._artifact_lock:
+            self._artifact = artifact
+        return artifact['version']
+
+    def current_artifact(self):
+        """
+        Returns the score model for the current training data.
+
+        The training data is hashed on every call, and the model is loaded
+        again (and retrained or updated by model_b if needed) when the hash
+        differs from the loaded model's, so newly rated books are picked up
+        without a /reload.
+        """
+        from model_b import load_model, load_training_data, FEATURE_COLUMNS, TARGET_COLUMN, MODEL_FORMAT
+        from model_store import training_data_hash
+
+        training_df = load_training_data()
+        data_hash = training_data_hash(training_df, FEATURE_COLUMNS + [TARGET_COLUMN], model_format=MODEL_FORMAT)
+        with self._artifact_lock:
+            artifact = self._artifact
+        if artifact is None or artifact['data_hash'] != data_hash:
+            artifact = load_model(training_df)
+            with self._artifact_lock:
+                self._artifact = artifact
+        return artifact
+
+    @property
+    def model_version(self):
+        with self._artifact_lock:
+            artifact = self._artifact
+        return f"random-forest-{artifact['version']}" if artifact is not None else None
+
+    def _score_reviews(self, reviews):
+        from ScrapeSentiment_Function import analyze_sentiment_batch
+        from review_classifier import default_classifier
+
+        sentiments = analyze_sentiment_batch(reviews, backend=self.backend)
+        categories = default_classifier.classify_batch(reviews)
+        return list(zip(categories, sentiments))
+
+    def _predict_books(self, books):
+        import pandas as pd
+        from model_b import predict_scores
+
+        # Checked once per micro-batch, so every book in it uses the same model
+        artifact = self.current_artifact()
+        predictions = predict_scores(pd.DataFrame(books), artifact)
+        model_version = f"random-forest-{artifact['version']}"
+        return [(prediction.item() if hasattr(prediction, 'item') else prediction, model_version)
+                for prediction in predictions]
+
+    def score_reviews(self, reviews):
+        """Returns (categories, sentiments) for the review texts."""
+        results = self.review_batcher.submit(reviews)
+        return [category for category, _ in results], [sentiment for _, sentiment in results]
+
+    def predict_books(self, books):
+        """Returns (predictions, model version) for book rows with the model's feature columns."""
+        results = self.book_batcher.submit(books)
+        model_version = results[0][1] if results else self.model_version
+        return [prediction for prediction, _ in results], model_version
+
+    def status(self):
+        return {
+            'status': 'ok',
+            'uptime': time.time() - self.started_at,
+            'model_version': self.model_version,
+            'review_batches': self.review_batcher.batches,
+            'reviews_scored': self.review_batcher.items,
+            'book_batches': self.book_batcher.batches,
+            'books_predicted': self.book_batcher.items,
+        }
+
+    def close(self):
+        self.review_batcher.close()
+        self.book_batcher.close()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.service.status())
+        else:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+            if self.path == '/score':
+                categories, sentiments = self.service.score_reviews(payload.get('reviews', []))
+                self._send_json(200, {'categories': categories, 'sentiments': sentiments})
+            elif self.path == '/predict':
+                predictions, model_version = self.service.predict_books(payload.get('books', []))
+                self._send_json(200, {'predictions': predictions, 'model_version': model_version})
+            elif self.path == '/reload':
+                self._send_json(200, {'model_version': f"random-forest-{self.service.reload_model()}"})
+            else:
+                self._send_json(404, {'error': f"Unknown path {self.path}"})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        # Keep the console quiet; errors are returned to the client
+        pass
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, backend=None, warm_up=True):
+    """Runs the service until interrupted."""
+    service = PredictionService(backend=backend)
+    if warm_up:
+        service.warm_up()
+
+    handler = type('RequestHandler', (_RequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"Prediction service listening on http://{host}:{port} (model {service.model_version})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+class ServiceError(RuntimeError):
+    pass
+
+
+class ServiceClient:
+    """
+    Thin client for a running prediction service.
+
+    Parameters:
+        host (str): Service host.
+        port (int): Service port.
+        timeout (float): Seconds to wait for a response.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=300):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None, timeout=None):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=timeout or self.timeout)
+        try:
+            body = json.dumps(payload).encode('utf-8') if payload is not None else None
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            result = json.loads(response.read() or b'{}')
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise ServiceError(result.get('error', f"HTTP {response.status}"))
+        return result
+
+    def health(self, timeout=None):
+        return self._request('GET', '/health', timeout=timeout)
+
+    def is_running(self):
+        try:
+            return self.health(timeout=PROBE_TIMEOUT).get('status') == 'ok'
+        except (OSError, ValueError, ServiceError):
+            return False
+
+    def score_reviews(self, reviews):
+        """Returns (categories, sentiments) with sentiments as (label, signed score) tuples."""
+        result = self._request('POST', '/score', {'reviews': list(reviews)})
+        return result['categories'], [tuple(sentiment) for sentiment in result['sentiments']]
+
+    def predict_books(self, books):
+        """Returns (predictions, model version) for a list of book row dicts."""
+        result = self._request('POST', '/predict', {'books': list(books)})
+        return result['predictions'], result['model_version']
+
+    def reload(self):
+        return self._request('POST', '/reload')['model_version']
+
+
+def get_service_client(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Returns a client for the prediction service if it is running, otherwise None.
+
+    Setting the BOOK_AI_SERVICE environment variable to "off" always returns None.
+    """
+    if os.environ.get('BOOK_AI_SERVICE', '').lower() == 'off':
+        return None
+    client = ServiceClient(host, port)
+    return client if client.is_running() else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run or query the local prediction service.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="Start the service.")
+    serve_parser.add_argument('--backend', help="Sentiment backend: pytorch, quantized or onnx.")
+    serve_parser.add_argument('--lazy', action='store_true', help="Load models on first request.")
+
+    commands.add_parser('status', help="Show the status of a running service.")
+    commands.add_parser('reload', help="Reload the score model now.")
+    score_parser = commands.add_parser('score', help="Score review texts.")
+    score_parser.add_argument('reviews', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.host, args.port, backend=args.backend, warm_up=not args.lazy)
+        return
+
+    client = ServiceClient(args.host, args.port)
+    if args.command == 'status':
+        print(json.dumps(client.health(), indent=1))
+    elif args.command == 'reload':
+        print(f"Loaded model {client.reload()}")
+    elif args.command == 'score':
+        categories, sentiments = client.score_reviews(args.reviews)
+        for review, category, (label, score) in zip(args.reviews, categories, sentiments):
+            print(f"{category:<8} {label:<8} {score:+.3f}  {review[:60]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import re
+import json
+from bisect import bisect_right
+
+'''
+Keyword-based review categories shared by every scraper.
+
+All keyword sets are compiled once into a single regular expression, so a
+review (or a whole batch of reviews) is classified in one scan of its text.
+Categories are checked in priority order: a review that mentions any "Ending"
+keyword is an Ending review even if it also mentions a "Journey" keyword.
+'''
+
+# Category name -> keywords, in priority order
+DEFAULT_CATEGORIES = {
+    "Ending": ["ending", "final", "conclusion", "last chapter", "wrap up", "cliffhanger"],
+    "Journey": ["journey", "plot", "story", "characters", "development"],
+}
+
+DEFAULT_CATEGORY = "General"
+
+# Joins reviews in a batch; it cannot occur inside a keyword, so no match spans two reviews
+_BATCH_SEPARATOR = "\x00"
+
+
+class ReviewClassifier:
+    """Classifies reviews into keyword categories using one compiled multi-pattern matcher."""
+
+    def __init__(self, categories=None, default_category=DEFAULT_CATEGORY):
+        self.categories = dict(categories if categories is not None else DEFAULT_CATEGORIES)
+        self.default_category = default_category
+        self._names = list(self.categories)
+        if not self._names:
+            raise ValueError("At least one review category is required.")
+
+        # One named group per category. The lookahead makes every starting
+        # position a candidate, so overlapping keywords from different
+        # categories are all found, matching plain substring checks.
+        groups = []
+        for index, (name, keywords) in enumerate(self.categories.items()):
+            # An empty alternative would match at every position and claim every review
+            if not keywords or any(not keyword for keyword in keywords):
+                raise ValueError(f"Category '{name}' must have at least one keyword and no empty keywords.")
+            # Longest keywords first so the reported match is the longest one at a position
+            ordered = sorted(set(keywords), key=len, reverse=True)
+            groups.append(f"(?P<c{index}>{'|'.join(re.escape(keyword) for keyword in ordered)})")
+        self._pattern = re.compile(f"(?=(?:{'|'.join(groups)}))", re.IGNORECASE)
+
+    @classmethod
+    def from_json(cls, path, default_category=DEFAULT_CATEGORY):
+        """Builds a classifier from a JSON file mapping category names to keyword lists."""
+        with open(path, encoding='utf-8') as file:
+            return cls(json.load(file), default_category)
+
+    def _iter_matches(self, text):
+        for match in self._pattern.finditer(text):
+            group = match.lastgroup
+            keyword = match.group(group)
+            yield int(group[1:]), keyword, match.start(), match.start() + len(keyword)
+
+    def find_matches(self, text):
+        """Returns (category, keyword, start, end) for every keyword occurrence in the text."""
+        return [(self._names[index], keyword.lower(), start, end)
+                for index, keyword, start, end in self._iter_matches(text)]
+
+    def classify(self, text):
+        """Returns the highest-priority category whose keywords appear in the text."""
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts, with_matches=False):
+        """
+        Classify a batch of reviews in a single scan over their joined text.
+
+        Parameters:
+            texts (list[str]): Review texts.
+            with_matches (bool): Also return each review's keyword matches.
+
+        Returns:
+            list: The category of each review, or (category, matches) pairs when
+            with_matches is True. Match positions are relative to each review.
+        """
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + len(_BATCH_SEPARATOR)
+        joined = _BATCH_SEPARATOR.join(texts)
+
+        best = [len(self._names)] * len(texts)
+        matches = [[] for _ in texts]
+        for index, keyword, start, end in self._iter_matches(joined):
+            review = bisect_right(offsets, start) - 1
+            if index < best[review]:
+                best[review] = index
+            if with_matches:
+                offset = offsets[review]
+                matches[review].append((self._names[index], keyword.lower(), start - offset, end - offset))
+
+        categories = [self._names[index] if index < len(self._names) else self.default_category
+                      for index in best]
+        if with_matches:
+            return list(zip(categories, matches))
+        return categories
+
+
+# Shared classifier using the default categories
+default_classifier = ReviewClassifier()
+
+
+def classify_review(content):
+    """Classifies a review into "Ending", "Journey" or "General" using the default categories."""
+    return default_classifier.classify(content)
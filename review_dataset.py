@@ -0,0 +1,137 @@
+import os
+import time
+import shutil
+from urllib.parse import quote
+
+'''
+Columnar review dataset: Parquet files partitioned by book.
+
+Reviews are stored under <save folder>/reviews_dataset/book=<title>/ with
+float32 scores and dictionary-encoded Category and Sentiment columns. Readers
+ask for only the columns they need and can filter by book and category, so
+the cleaning step never parses review text it does not use.
+'''
+
+DATASET_FOLDER_NAME = 'reviews_dataset'
+PARTITION_COLUMN = 'book'
+
+
+def dataset_path(save_folder):
+    """Returns the dataset folder that sits next to the review CSVs in save_folder."""
+    return os.path.join(save_folder, DATASET_FOLDER_NAME)
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('Review ID', pa.string()),
+        ('Review', pa.string()),
+        ('Category', pa.dictionary(pa.int8(), pa.string())),
+        ('Sentiment', pa.dictionary(pa.int8(), pa.string())),
+        ('Confidence Score', pa.float32()),
+    ])
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive')
+
+
+def _partition_folder(root, book_title):
+    # Titles are percent-encoded so any character is safe in a folder name; pyarrow decodes them on read
+    return os.path.join(root, f"{PARTITION_COLUMN}={quote(book_title, safe='')}")
+
+
+def write_book_reviews(book_title, contents, categories, sentiments, save_folder, append=False):
+    """
+    Write a book's classified and scored reviews to its dataset partition.
+
+    Parameters:
+        book_title (str): The title of the book (the partition key).
+        contents (list[str]): Review texts.
+        categories (list[str]): Category of each review.
+        sentiments (list[tuple[str, float]]): (label, signed score) of each review.
+        save_folder (str): Folder holding the dataset.
+        append (bool): Add a new file to the partition instead of replacing it.
+
+    Returns:
+        str: Path to the book's partition folder.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from ScrapeSentiment_Function import review_id
+
+    table = pa.Table.from_pydict({
+        'Review ID': [review_id(content) for content in contents],
+        'Review': list(contents),
+        'Category': list(categories),
+        'Sentiment': [label for label, _ in sentiments],
+        'Confidence Score': [score for _, score in sentiments],
+    }, schema=_schema())
+
+    folder = _partition_folder(dataset_path(save_folder), book_title)
+    if not append and os.path.isdir(folder):
+        shutil.rmtree(folder)
+    os.makedirs(folder, exist_ok=True)
+
+    # Write under a temporary name so readers never see a half-written file
+    name = f"part-{time.time_ns()}.parquet"
+    temp_path = os.path.join(folder, f".{name}.tmp")
+    pq.write_table(table, temp_path, compression='zstd')
+    os.replace(temp_path, os.path.join(folder, name))
+    return folder
+
+
+def has_book(save_folder, book_title):
+    """Checks whether a book already has a partition in the dataset."""
+    return os.path.isdir(_partition_folder(dataset_path(save_folder), book_title))
+
+
+def import_review_csv(file_path, book_title, save_folder):
+    """Copies the reviews in a book's CSV file into its dataset partition, replacing the partition."""
+    import csv
+
+    contents, categories, sentiments = [], [], []
+    with open(file_path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            contents.append(row.get('Review') or "")
+            categories.append(row.get('Category') or "General")
+            sentiments.append((row.get('Sentiment') or "", float(row.get('Confidence Score') or 0)))
+    return write_book_reviews(book_title, contents, categories, sentiments, save_folder)
+
+
+def read_reviews(save_folder, columns=(PARTITION_COLUMN, 'Category', 'Confidence Score'),
+                 books=None, categories=None):
+    """
+    Read reviews from the dataset as a DataFrame.
+
+    Parameters:
+        save_folder (str): Folder holding the dataset.
+        columns (sequence[str]): Columns to load; "book" is the book title.
+        books (list[str]): Only load these books.
+        categories (list[str]): Only load reviews in these categories.
+
+    Returns:
+        pandas.DataFrame: The requested columns for the matching reviews.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(dataset_path(save_folder), format='parquet', partitioning=_partitioning(),
+                         exclude_invalid_files=True)
+
+    condition = None
+    if books is not None:
+        condition = ds.field(PARTITION_COLUMN).isin(list(books))
+    if categories is not None:
+        category_condition = ds.field('Category').isin(list(categories))
+        condition = category_condition if condition is None else condition & category_condition
+
+    return dataset.to_table(columns=list(columns), filter=condition).to_pandas()
+
+
+def has_dataset(save_folder):
+    """Checks whether save_folder contains a review dataset."""
+    return os.path.isdir(dataset_path(save_folder))
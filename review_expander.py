@@ -0,0 +1,109 @@
+'''
+Load more reviews on a Goodreads page by clicking "Show more reviews".
+
+After each click the browser waits for new review sections to appear, using a
+MutationObserver instead of a fixed sleep. Only the reviews added by that
+click are read back, so the page is never re-parsed as a whole. Expansion
+stops when the review budget is reached, the button disappears, or a click
+adds nothing within the timeout.
+'''
+
+REVIEW_SECTION_SELECTOR = 'section.ReviewText__content'
+REVIEW_TEXT_SELECTOR = 'div.TruncatedContent__text'
+SHOW_MORE_XPATH = "//button[contains(., 'Show more reviews')]"
+
+DEFAULT_MAX_REVIEWS = 300
+DEFAULT_EXPAND_TIMEOUT = 10
+
+# Returns the text of every review section from index arguments[0] onwards
+_READ_REVIEWS_SCRIPT = f'''
+const sections = document.querySelectorAll('{REVIEW_SECTION_SELECTOR}');
+const reviews = [];
+for (let i = arguments[0]; i < sections.length; i++) {{
+    const content = sections[i].querySelector('{REVIEW_TEXT_SELECTOR}');
+    reviews.push(content ? content.textContent.trim() : 'No content');
+}}
+return reviews;
+'''
+
+# Clicks the button, then resolves with the review count once it grows past
+# arguments[1] or the timeout (arguments[2], in ms) runs out
+_CLICK_AND_WAIT_SCRIPT = f'''
+const [button, known, timeoutMs, done] = arguments;
+const count = () => document.querySelectorAll('{REVIEW_SECTION_SELECTOR}').length;
+let timer = null;
+const observer = new MutationObserver(() => {{
+    if (count() > known) {{
+        observer.disconnect();
+        clearTimeout(timer);
+        done(count());
+    }}
+}});
+observer.observe(document.body, {{childList: true, subtree: true}});
+timer = setTimeout(() => {{ observer.disconnect(); done(count()); }}, timeoutMs);
+button.click();
+if (count() > known) {{
+    observer.disconnect();
+    clearTimeout(timer);
+    done(count());
+}}
+'''
+
+
+def expand_and_extract(driver, max_reviews=DEFAULT_MAX_REVIEWS, timeout=DEFAULT_EXPAND_TIMEOUT):
+    """
+    Expand the reviews on the page already loaded in `driver` and return their text.
+
+    Parameters:
+        driver: Selenium WebDriver with a Goodreads book page loaded.
+        max_reviews (int): Stop once this many reviews have been collected.
+        timeout (float): Seconds to wait for a click to add reviews.
+
+    Returns:
+        list[str]: Review texts in page order, at most max_reviews of them.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import WebDriverException
+
+    # Leave the async script enough time to hit its own timeout first
+    driver.set_script_timeout(timeout + 5)
+
+    reviews = driver.execute_script(_READ_REVIEWS_SCRIPT, 0)
+    while len(reviews) < max_reviews:
+        buttons = driver.find_elements(By.XPATH, SHOW_MORE_XPATH)
+        if not buttons:
+            break
+
+        known = len(reviews)
+        try:
+            total = driver.execute_async_script(_CLICK_AND_WAIT_SCRIPT, buttons[0], known, int(timeout * 1000))
+        except WebDriverException:
+            break
+        if total <= known:
+            break
+
+        # Read back only the reviews added by this click
+        reviews.extend(driver.execute_script(_READ_REVIEWS_SCRIPT, known))
+
+    return reviews[:max_reviews]
+
+
+def fetch_expanded_reviews(url, max_reviews=DEFAULT_MAX_REVIEWS, timeout=DEFAULT_EXPAND_TIMEOUT, snapshot=True):
+    """
+    Load a Goodreads page in a pooled browser, expand its reviews and return their text.
+
+    With snapshot=True the expanded page is kept in the snapshot store for later replay.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from driver_pool import get_driver_pool
+    from page_fetcher import save_snapshot
+
+    with get_driver_pool().session() as driver:
+        try:
+            driver.get(url)
+        except TimeoutException:
+            raise TimeoutException("The page took too long to load. Try again later.")
+        reviews = expand_and_extract(driver, max_reviews, timeout)
+        if snapshot:
+            save_snapshot(url, driver.page_source, 'selenium')
+        return reviews
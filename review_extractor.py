@@ -0,0 +1,113 @@
+'''
+Pull review text out of Goodreads page HTML.
+
+Only the review containers are parsed: each `section.ReviewText__content`
+becomes the text of its `div.TruncatedContent__text` (or "No content" when the
+div is missing), matching what scrape_goodreads has always stored. Several
+parser backends are supported and the fastest installed one is used unless
+one is asked for explicitly:
+
+    "selectolax"   - selectolax's Lexbor/Modest HTML parser (C)
+    "lxml"         - lxml.html with XPath (C)
+    "soupstrainer" - BeautifulSoup restricted to review sections by a SoupStrainer
+'''
+
+REVIEW_SECTION_CLASS = 'ReviewText__content'
+REVIEW_TEXT_CLASS = 'TruncatedContent__text'
+MISSING_CONTENT = "No content"
+
+# Backends in order of preference
+EXTRACTION_BACKENDS = ("selectolax", "lxml", "soupstrainer")
+
+
+def _extract_selectolax(html):
+    from selectolax.parser import HTMLParser
+
+    reviews = []
+    for section in HTMLParser(html).css(f'section.{REVIEW_SECTION_CLASS}'):
+        content_div = section.css_first(f'div.{REVIEW_TEXT_CLASS}')
+        reviews.append(content_div.text(deep=True).strip() if content_div is not None else MISSING_CONTENT)
+    return reviews
+
+
+def _class_xpath(tag, class_name):
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def _extract_lxml(html):
+    import lxml.html
+
+    if not html.strip():
+        return []
+    reviews = []
+    root = lxml.html.fromstring(html)
+    for section in root.xpath('//' + _class_xpath('section', REVIEW_SECTION_CLASS)):
+        content_divs = section.xpath('.//' + _class_xpath('div', REVIEW_TEXT_CLASS))
+        reviews.append(content_divs[0].text_content().strip() if content_divs else MISSING_CONTENT)
+    return reviews
+
+
+def _extract_soupstrainer(html):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    only_reviews = SoupStrainer('section', class_=REVIEW_SECTION_CLASS)
+    soup = BeautifulSoup(html, 'html.parser', parse_only=only_reviews)
+
+    reviews = []
+    for section in soup.find_all('section', class_=REVIEW_SECTION_CLASS):
+        content_div = section.find('div', class_=REVIEW_TEXT_CLASS)
+        reviews.append(content_div.text.strip() if content_div else MISSING_CONTENT)
+    return reviews
+
+
+_EXTRACTORS = {
+    "selectolax": (_extract_selectolax, "selectolax.parser"),
+    "lxml": (_extract_lxml, "lxml.html"),
+    "soupstrainer": (_extract_soupstrainer, "bs4"),
+}
+
+_default_backend = None
+
+
+def available_backends():
+    """Returns the extraction backends whose parser library is installed."""
+    import importlib.util
+
+    available = []
+    for backend in EXTRACTION_BACKENDS:
+        module = _EXTRACTORS[backend][1]
+        try:
+            found = importlib.util.find_spec(module) is not None
+        except ModuleNotFoundError:
+            found = False
+        if found:
+            available.append(backend)
+    return available
+
+
+def default_backend():
+    """Returns the fastest installed extraction backend."""
+    global _default_backend
+    if _default_backend is None:
+        available = available_backends()
+        if not available:
+            raise ImportError("No HTML parser installed; install selectolax, lxml or beautifulsoup4.")
+        _default_backend = available[0]
+    return _default_backend
+
+
+def extract_reviews(html, backend=None):
+    """
+    Extract the text of every review on a Goodreads page.
+
+    Parameters:
+        html (str): Page source.
+        backend (str): One of EXTRACTION_BACKENDS; defaults to the fastest installed one.
+
+    Returns:
+        list[str]: Review texts in page order.
+    """
+    backend = backend or default_backend()
+    if backend not in _EXTRACTORS:
+        raise ValueError(f"Unknown extraction backend '{backend}'. Choose one of {EXTRACTION_BACKENDS}.")
+    return _EXTRACTORS[backend][0](html)
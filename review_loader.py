@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+'''
+Typed, column-projected loading of review CSV files.
+
+Only the requested columns are parsed, with compact dtypes: categories for
+Category and Sentiment and float32 for Confidence Score, so the large Review
+text column is never loaded unless asked for. The pyarrow CSV engine is used
+when it is installed. Many files are read in parallel and stacked with a
+single concatenation; the book each row came from is attached as a
+categorical column built from file lengths, without per-file copies.
+'''
+
+DEFAULT_COLUMNS = ['Category', 'Confidence Score']
+
+# Reading is worth spreading over a pool only for this many files or more
+PARALLEL_THRESHOLD = 16
+
+_engine = None
+
+
+def _csv_engine():
+    global _engine
+    if _engine is None:
+        import importlib.util
+        _engine = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+    return _engine
+
+
+def review_dtypes():
+    """Returns the compact dtype of each known review column."""
+    from pandas import CategoricalDtype
+    from review_classifier import DEFAULT_CATEGORIES, DEFAULT_CATEGORY
+
+    # Fixed category sets let per-file categoricals concatenate without falling back to object
+    return {
+        'Category': CategoricalDtype(list(DEFAULT_CATEGORIES) + [DEFAULT_CATEGORY]),
+        'Sentiment': CategoricalDtype(['POSITIVE', 'NEGATIVE']),
+        'Confidence Score': 'float32',
+        'Review ID': 'string',
+        'Review': 'string',
+    }
+
+
+def read_review_file(path, columns=DEFAULT_COLUMNS):
+    """
+    Read the given columns of one review CSV with compact dtypes.
+
+    Raises:
+        ValueError or KeyError: If the file lacks one of the columns.
+    """
+    import pandas as pd
+
+    dtypes = review_dtypes()
+    return pd.read_csv(path, usecols=list(columns), engine=_csv_engine(),
+                       dtype={column: dtypes[column] for column in columns if column in dtypes})
+
+
+def _read_or_none(path, columns):
+    try:
+        return read_review_file(path, columns)
+    except (ValueError, KeyError):
+        # Missing columns (the pyarrow engine reports them as KeyError)
+        return None
+
+
+def load_review_files(paths, columns=DEFAULT_COLUMNS, labels=None, label_column='book',
+                      workers=None, use_processes=False):
+    """
+    Load many review CSVs into one DataFrame.
+
+    Parameters:
+        paths (list[str]): Review CSV files.
+        columns (list[str]): Columns to read from each file.
+        labels (list[str]): Value of label_column for each file's rows (e.g. the book title).
+        label_column (str): Name of the column holding the labels.
+        workers (int): Pool size; defaults to the CPU count. Fewer than
+            PARALLEL_THRESHOLD files are read in the calling thread.
+        use_processes (bool): Use a process pool instead of a thread pool.
+
+    Returns:
+        tuple: (DataFrame, list of paths skipped because they lacked a column)
+    """
+    import numpy as np
+    import pandas as pd
+
+    paths = list(paths)
+    if len(paths) < PARALLEL_THRESHOLD:
+        frames = [_read_or_none(path, columns) for path in paths]
+    else:
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as executor:
+            frames = list(executor.map(_read_or_none, paths, [columns] * len(paths), chunksize=8 if use_processes else 1))
+
+    skipped = [path for path, frame in zip(paths, frames) if frame is None]
+    kept = [(i, frame) for i, frame in enumerate(frames) if frame is not None]
+
+    if not kept:
+        dtypes = review_dtypes()
+        df = pd.DataFrame({column: pd.Series(dtype=dtypes.get(column, 'object')) for column in columns})
+    else:
+        df = pd.concat([frame for _, frame in kept], ignore_index=True)
+
+    if labels is not None:
+        labels = list(labels)
+        categories = list(dict.fromkeys(labels))
+        positions = {label: i for i, label in enumerate(categories)}
+        codes = np.repeat([positions[labels[i]] for i, _ in kept], [len(frame) for _, frame in kept]).astype('int32')
+        df[label_column] = pd.Categorical.from_codes(codes, categories=categories)
+
+    return df, skipped
@@ -0,0 +1,230 @@
+import time
+import queue
+import threading
+
+'''
+Streaming scrape -> extract -> classify -> score -> write pipeline.
+
+Each stage runs in its own thread(s) and hands books to the next stage through
+a bounded queue, so page loads, parsing, model inference and file writes for
+different books overlap instead of running one after another. The scoring
+stage gathers reviews from several books into shared model batches. Every
+stage records how many books and reviews it handled and how long it was busy,
+so the slowest stage is easy to spot.
+
+A book that fails in one stage is passed along with its error and skipped by
+the remaining stages.
+'''
+
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_FETCH_WORKERS = 4
+
+# The score stage keeps pulling waiting books until it has this many reviews
+SCORE_BATCH_REVIEWS = 256
+
+_DONE = object()
+
+
+class BookItem:
+    """A book moving through the pipeline, filled in stage by stage."""
+
+    def __init__(self, book_title, url):
+        self.book_title = book_title
+        self.url = url
+        self.html = None
+        self.contents = None
+        self.categories = None
+        self.sentiments = None
+        self.file = None
+        self.error = None
+
+
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.books = 0
+        self.reviews = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, items, seconds):
+        with self._lock:
+            self.books += len(items)
+            self.reviews += sum(len(item.contents or ()) for item in items)
+            self.busy_seconds += seconds
+
+    def summary(self, wall_seconds):
+        busy = self.busy_seconds or 1e-9
+        return (f"{self.name:<9} {self.books:5d} books {self.reviews:7d} reviews  "
+                f"busy {self.busy_seconds:7.2f}s ({self.busy_seconds / wall_seconds:6.1%} of wall)  "
+                f"{self.books / busy:7.2f} books/s {self.reviews / busy:8.1f} reviews/s while busy")
+
+
+class _Stage:
+    def __init__(self, name, process, workers=1, batch_reviews=None):
+        self.name = name
+        self.process = process
+        self.workers = workers
+        self.batch_reviews = batch_reviews
+        self.stats = StageStats(name)
+
+
+def _take_batch(inbox, first, batch_reviews):
+    # Pull more waiting books without blocking until the batch is large enough
+    batch = [first]
+    reviews = len(first.contents or ())
+    while reviews < batch_reviews:
+        try:
+            item = inbox.get_nowait()
+        except queue.Empty:
+            break
+        if item is _DONE:
+            inbox.put(_DONE)
+            break
+        batch.append(item)
+        reviews += len(item.contents or ())
+    return batch
+
+
+def _run_stage(stage, inbox, outbox, remaining, lock):
+    while True:
+        item = inbox.get()
+        if item is _DONE:
+            # Let sibling workers see the end marker too; the last one forwards it
+            inbox.put(_DONE)
+            with lock:
+                remaining[stage.name] -= 1
+                last = remaining[stage.name] == 0
+            if last:
+                outbox.put(_DONE)
+            return
+
+        batch = _take_batch(inbox, item, stage.batch_reviews) if stage.batch_reviews else [item]
+        pending = [book for book in batch if book.error is None]
+        if pending:
+            start = time.perf_counter()
+            try:
+                stage.process(pending)
+            except Exception as e:
+                for book in pending:
+                    book.error = f"{stage.name}: {e}"
+            stage.stats.record(pending, time.perf_counter() - start)
+
+        for book in batch:
+            outbox.put(book)
+
+
+def _fetch(items):
+    from page_fetcher import fetch_page
+    for item in items:
+        item.html = fetch_page(item.url).html
+
+
+def _extract(items):
+    from review_extractor import extract_reviews
+    for item in items:
+        item.contents = extract_reviews(item.html)
+        item.html = None  # Free the page source as soon as it has been parsed
+        if not item.contents:
+            raise ValueError("No reviews found on the provided page.")
+
+
+def _classify(items):
+    from review_classifier import default_classifier
+    for item in items:
+        item.categories = default_classifier.classify_batch(item.contents)
+
+
+def _score(items):
+    from ScrapeSentiment_Function import analyze_sentiment_batch
+
+    # One call for every review in the batch of books, then split back per book
+    sentiments = analyze_sentiment_batch([content for item in items for content in item.contents])
+    start = 0
+    for item in items:
+        item.sentiments = sentiments[start:start + len(item.contents)]
+        start += len(item.contents)
+
+
+def run_pipeline(books, save_folder=None, writer=None, fetch_workers=DEFAULT_FETCH_WORKERS,
+                 queue_size=DEFAULT_QUEUE_SIZE, score_batch_reviews=SCORE_BATCH_REVIEWS, report=True):
+    """
+    Scrape, classify, score and save many books as overlapping streaming stages.
+
+    Parameters:
+        books (list[tuple[str, str]]): (book title, Goodreads URL) pairs.
+        save_folder (str): Folder for the review files (defaults to scrape_goodreads' folder).
+        writer (callable): writer(book_title, contents, categories, sentiments, save_folder)
+            returning the saved path; defaults to writing the CSV file and the
+            Parquet review dataset.
+        fetch_workers (int): Pages fetched at the same time.
+        queue_size (int): Books allowed to wait between two stages.
+        score_batch_reviews (int): Reviews gathered across books for one scoring call.
+        report (bool): Print per-stage throughput when done.
+
+    Returns:
+        tuple: (results, stats) where results maps each book title to
+        {'file': path or None, 'error': message or None} and stats is the
+        list of StageStats in stage order.
+    """
+    from ScrapeSentiment_Function import DEFAULT_SAVE_FOLDER, write_reviews
+
+    save_folder = save_folder or DEFAULT_SAVE_FOLDER
+    writer = writer or write_reviews
+
+    def _write(items):
+        for item in items:
+            item.file = writer(item.book_title, item.contents, item.categories, item.sentiments, save_folder)
+
+    stages = [
+        _Stage("fetch", _fetch, workers=fetch_workers),
+        _Stage("extract", _extract),
+        _Stage("classify", _classify),
+        _Stage("score", _score, batch_reviews=score_batch_reviews),
+        _Stage("write", _write),
+    ]
+
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    remaining = {stage.name: stage.workers for stage in stages}
+    lock = threading.Lock()
+    threads = []
+    for stage, inbox, outbox in zip(stages, queues, queues[1:]):
+        for _ in range(stage.workers):
+            thread = threading.Thread(target=_run_stage, args=(stage, inbox, outbox, remaining, lock),
+                                      name=f"pipeline-{stage.name}", daemon=True)
+            thread.start()
+            threads.append(thread)
+
+    start = time.perf_counter()
+    results = {}
+
+    # Feed books from a separate thread so the bounded first queue cannot block collection
+    def _feed():
+        for book_title, url in books:
+            queues[0].put(BookItem(book_title, url))
+        queues[0].put(_DONE)
+
+    feeder = threading.Thread(target=_feed, name="pipeline-feed", daemon=True)
+    feeder.start()
+
+    while True:
+        item = queues[-1].get()
+        if item is _DONE:
+            break
+        results[item.book_title] = {'file': item.file, 'error': item.error}
+        if item.error:
+            print(f"Error processing '{item.book_title}': {item.error}")
+
+    feeder.join()
+    for thread in threads:
+        thread.join()
+
+    wall = time.perf_counter() - start
+    stats = [stage.stats for stage in stages]
+    if report:
+        print(f"Pipeline finished {len(results)} books in {wall:.2f}s")
+        for stage_stats in stats:
+            print("  " + stage_stats.summary(wall))
+    return results, stats
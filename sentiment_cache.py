@@ -0,0 +1,133 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+
+'''
+Persistent, content-addressed cache of review sentiment scores.
+
+Scores are stored in a small SQLite database keyed by a hash of the normalised
+review text together with the model id, so a review that has already been
+scored by the same model is never sent through the model again. The cache is
+bounded by entry count; when it grows past the limit the least recently used
+entries are evicted.
+'''
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'sentiment_cache.sqlite')
+
+# Each entry is a fixed-size row (hash, label, score, timestamp), so the entry
+# count bounds the size of the cache file.
+DEFAULT_MAX_ENTRIES = 500000
+
+# Fraction of max_entries kept after an eviction pass, so eviction does not
+# run again on the very next insert.
+EVICTION_TARGET = 0.9
+
+_whitespace = re.compile(r'\s+')
+
+
+def normalize_review_text(text):
+    """Normalises review text so trivially different copies share a cache entry."""
+    text = text.replace('\u200b', '').replace('\ufeff', '')
+    return _whitespace.sub(' ', text).strip().lower()
+
+
+def cache_key(text, model_id):
+    """Returns the content hash used to look up a review scored by model_id."""
+    payload = f"{model_id}\0{normalize_review_text(text)}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SentimentCache:
+    """SQLite-backed sentiment cache with LRU eviction and hit/miss statistics."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS sentiment (
+                key TEXT PRIMARY KEY,
+                label TEXT NOT NULL,
+                score REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS sentiment_last_used ON sentiment (last_used)')
+        self._conn.commit()
+
+    def get_many(self, texts, model_id):
+        """
+        Look up cached results for a list of reviews.
+
+        Returns:
+            dict: Maps the index of each cached review to its (label, score).
+        """
+        keys = [cache_key(text, model_id) for text in texts]
+        found = {}
+        with self._lock:
+            # Query in chunks to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, label, score FROM sentiment WHERE key IN ({placeholders})', chunk)
+                found.update({key: (label, score) for key, label, score in rows})
+
+            if found:
+                now = time.time()
+                self._conn.executemany('UPDATE sentiment SET last_used = ? WHERE key = ?',
+                                       [(now, key) for key in found])
+                self._conn.commit()
+
+            results = {i: found[key] for i, key in enumerate(keys) if key in found}
+            self.hits += len(results)
+            self.misses += len(keys) - len(results)
+        return results
+
+    def put_many(self, texts, model_id, results):
+        """Stores (label, score) results for the given reviews."""
+        now = time.time()
+        rows = [(cache_key(text, model_id), label, float(score), now)
+                for text, (label, score) in zip(texts, results)]
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?)', rows)
+            self._conn.commit()
+            self._evict()
+
+    def _evict(self):
+        count = self._conn.execute('SELECT COUNT(*) FROM sentiment').fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * EVICTION_TARGET)
+        self._conn.execute('''
+            DELETE FROM sentiment WHERE key IN (
+                SELECT key FROM sentiment ORDER BY last_used LIMIT ?
+            )
+        ''', (excess,))
+        self._conn.commit()
+
+    def stats(self):
+        """Returns hit/miss counters for this process and the current entry count."""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM sentiment').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
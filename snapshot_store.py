@@ -0,0 +1,216 @@
+import os
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+from collections import namedtuple
+
+'''
+Compressed store of fetched Goodreads pages.
+
+Every fetched page is kept as a zstd-compressed blob named by the SHA-256 of
+its HTML, so identical fetches share one file, and indexed in SQLite by URL
+and fetch time. Old snapshots are pruned by age and by a per-URL limit.
+
+With pages on disk, extraction and scoring can be re-run offline ("replay")
+after a change to the classifier or the model, and a recent enough snapshot
+can stand in for a fresh fetch.
+'''
+
+DEFAULT_SNAPSHOT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+DEFAULT_MAX_PER_URL = 5
+DEFAULT_MAX_AGE_DAYS = 180
+COMPRESSION_LEVEL = 10
+
+Snapshot = namedtuple('Snapshot', ['url', 'fetched_at', 'digest', 'source', 'size'])
+
+
+class SnapshotStore:
+    """
+    Content-addressed, zstd-compressed page snapshots indexed by URL and fetch time.
+
+    Parameters:
+        root (str): Folder holding the index and the compressed blobs.
+        max_per_url (int): Snapshots kept per URL; older ones are pruned.
+        max_age_days (float): Snapshots older than this are pruned.
+    """
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_FOLDER, max_per_url=DEFAULT_MAX_PER_URL,
+                 max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.root = root
+        self.max_per_url = max_per_url
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(root, 'blobs'), exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS snapshots (
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                digest TEXT NOT NULL,
+                source TEXT,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (url, fetched_at)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS snapshots_digest ON snapshots (digest)')
+        self._conn.commit()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, 'blobs', digest[:2], f"{digest}.html.zst")
+
+    def save(self, url, html, source=None, fetched_at=None):
+        """Stores a fetched page and returns its Snapshot record."""
+        import zstandard
+
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary name first so a crash never leaves a truncated blob
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as file:
+                file.write(zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(data))
+            os.replace(temp_path, path)
+
+        snapshot = Snapshot(url, fetched_at, digest, source, len(data))
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)', snapshot)
+            self._conn.commit()
+        self.prune(url)
+        return snapshot
+
+    def latest(self, url):
+        """Returns the newest Snapshot for a URL, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT * FROM snapshots WHERE url = ? ORDER BY fetched_at DESC LIMIT 1', (url,)).fetchone()
+        return Snapshot(*row) if row else None
+
+    def load(self, snapshot):
+        """Returns the HTML of a snapshot."""
+        import zstandard
+
+        with open(self._blob_path(snapshot.digest), 'rb') as file:
+            return zstandard.ZstdDecompressor().decompress(file.read()).decode('utf-8')
+
+    def get_fresh(self, url, max_age):
+        """Returns the newest snapshot's HTML if it is at most max_age seconds old, else None."""
+        snapshot = self.latest(url)
+        if snapshot is None or time.time() - snapshot.fetched_at > max_age:
+            return None
+        try:
+            return self.load(snapshot)
+        except FileNotFoundError:
+            return None
+
+    def urls(self):
+        """Returns every URL that has at least one snapshot."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT DISTINCT url FROM snapshots ORDER BY url')]
+
+    def prune(self, url=None):
+        """Applies the retention limits (to one URL, or to all) and deletes unreferenced blobs."""
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            urls = [url] if url is not None else [
+                row[0] for row in self._conn.execute('SELECT DISTINCT url FROM snapshots')]
+
+            candidates = set()
+            for target in urls:
+                rows = self._conn.execute(
+                    'SELECT fetched_at, digest FROM snapshots WHERE url = ? ORDER BY fetched_at DESC',
+                    (target,)).fetchall()
+                stale = [(fetched_at, digest) for i, (fetched_at, digest) in enumerate(rows)
+                         if i >= self.max_per_url or fetched_at < cutoff]
+                self._conn.executemany('DELETE FROM snapshots WHERE url = ? AND fetched_at = ?',
+                                       [(target, fetched_at) for fetched_at, _ in stale])
+                candidates.update(digest for _, digest in stale)
+            self._conn.commit()
+
+            # Blobs can be shared between URLs and fetches; only remove ones nothing points to
+            for digest in candidates:
+                in_use = self._conn.execute('SELECT 1 FROM snapshots WHERE digest = ? LIMIT 1', (digest,)).fetchone()
+                if not in_use:
+                    try:
+                        os.remove(self._blob_path(digest))
+                    except FileNotFoundError:
+                        pass
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Process-wide snapshot store, opened on first use
+_snapshot_store = None
+_snapshot_store_lock = threading.Lock()
+
+
+def get_snapshot_store():
+    """Returns the shared snapshot store, opening it on the first call."""
+    global _snapshot_store
+    if _snapshot_store is None:
+        with _snapshot_store_lock:
+            if _snapshot_store is None:
+                _snapshot_store = SnapshotStore()
+    return _snapshot_store
+
+
+def replay_books(books, save_folder=None, store=None, rescore=False):
+    """
+    Re-run extraction, classification and scoring from stored snapshots.
+
+    No browser or network is used: each book is processed from the newest
+    snapshot of its URL and books without a snapshot are reported as errors.
+
+    Parameters:
+        books (list[tuple[str, str]]): (book title, Goodreads URL) pairs.
+        save_folder (str): Folder for the review CSVs (defaults to scrape_goodreads' folder).
+        store (SnapshotStore): Store to read from (defaults to the shared one).
+        rescore (bool): Score every review with the model again instead of taking
+            cached scores, e.g. after a change to the scoring logic.
+
+    Returns:
+        dict: Maps each book title to {'file': CSV path or None, 'error': message or None}.
+    """
+    from review_extractor import extract_reviews
+    from ScrapeSentiment_Function import DEFAULT_SAVE_FOLDER, save_review_sentiment
+
+    store = store or get_snapshot_store()
+    save_folder = save_folder or DEFAULT_SAVE_FOLDER
+    results = {}
+    for book_title, url in books:
+        try:
+            snapshot = store.latest(url)
+            if snapshot is None:
+                raise LookupError(f"No snapshot stored for {url}")
+            contents = extract_reviews(store.load(snapshot))
+            if not contents:
+                raise ValueError("No reviews found in the stored page.")
+            file_path = save_review_sentiment(contents, book_title, save_folder, use_cache=not rescore)
+            results[book_title] = {'file': file_path, 'error': None}
+        except Exception as e:
+            results[book_title] = {'file': None, 'error': str(e) or type(e).__name__}
+            print(f"Error replaying '{book_title}': {results[book_title]['error']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score books from stored page snapshots.")
+    parser.add_argument('csv_file', help="CSV of book title, Goodreads URL rows (with a header row).")
+    parser.add_argument('--save-folder')
+    parser.add_argument('--rescore', action='store_true',
+                        help="Score every review with the model again, ignoring the sentiment cache.")
+    args = parser.parse_args()
+
+    from async_scraper import read_book_list
+    results = replay_books(read_book_list(args.csv_file), args.save_folder, rescore=args.rescore)
+    failed = sum(1 for result in results.values() if result['error'])
+    print(f"Replayed {len(results)} books ({failed} failed).")
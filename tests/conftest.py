@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# The modules under test live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import book_store
+from book_store import BookStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A book store in a temporary folder, installed as the shared store."""
+    # Keep the shared book store out of the repository
+    store = BookStore(str(tmp_path / 'books.sqlite'))
+    monkeypatch.setattr(book_store, '_book_store', store)
+    yield store
+    store.close()
+
+
+def _rated_books(count):
+    rows = []
+    for i in range(count):
+        score = [-3, 2, 4][i % 3]
+        rows.append({'Book Title': f"Book {i}", 'Author': f"Author {i % 4}", 'Genre': f"Genre {i % 2}",
+                     'Ending Score': score * 1.5 + i % 5, 'Journey Score': -score, 'My Score': score})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def rated_books():
+    """Factory for a table of rated books with three scores in equal numbers."""
+    return _rated_books
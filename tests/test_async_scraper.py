@@ -0,0 +1,31 @@
+import asyncio
+
+import page_fetcher
+from async_scraper import HostLimiter, _fetch_html
+
+
+class CountingLimiter(HostLimiter):
+    def __init__(self):
+        super().__init__(concurrency=1, rate=100, burst=10)
+        self.calls = []
+
+    async def run(self, url, make_request):
+        self.calls.append(url)
+        return await super().run(url, make_request)
+
+
+class FailingSession:
+    # Stands in for aiohttp.ClientSession when the HTTP attempt fails
+    def get(self, url, **kwargs):
+        raise asyncio.TimeoutError()
+
+
+def test_browser_fallback_goes_through_host_limiter(monkeypatch):
+    monkeypatch.setattr(page_fetcher, 'fetch_with_browser', lambda url: '<html>rendered</html>')
+    monkeypatch.setattr(page_fetcher, 'save_snapshot', lambda url, html, source: None)
+    limiter = CountingLimiter()
+
+    html = asyncio.run(_fetch_html(FailingSession(), limiter, 'https://www.goodreads.com/book/1', timeout=5))
+    assert html == '<html>rendered</html>'
+    # Once for the HTTP attempt and once for the browser fallback
+    assert limiter.calls == ['https://www.goodreads.com/book/1'] * 2
@@ -0,0 +1,60 @@
+import pytest
+
+
+def test_write_reviews_fills_reviews_table(tmp_path, store):
+    from ScrapeSentiment_Function import write_reviews
+
+    save_folder = str(tmp_path / 'CSV')
+    write_reviews('Book A', ['great ending', 'slow plot'], ['Ending', 'Journey'],
+                  [('POSITIVE', 0.9), ('NEGATIVE', -0.5)], save_folder)
+    assert len(store.review_scores_frame('Book A')) == 2
+
+    # Appending adds to the stored reviews; rewriting the book replaces them
+    write_reviews('Book A', ['quiet story'], ['Journey'], [('POSITIVE', 0.2)], save_folder, append=True)
+    assert len(store.review_scores_frame('Book A')) == 3
+    write_reviews('Book A', ['new ending'], ['Ending'], [('POSITIVE', 0.4)], save_folder)
+    assert store.review_scores_frame('Book A')['Category'].tolist() == ['Ending']
+
+
+def test_failed_dataset_write_keeps_reviews_in_csv(tmp_path, store, monkeypatch):
+    import review_dataset
+    from ScrapeSentiment_Function import review_csv_path, write_reviews, _upgrade_review_csv, review_id
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(review_dataset, 'write_book_reviews', fail)
+
+    save_folder = str(tmp_path / 'CSV')
+    with pytest.raises(OSError):
+        write_reviews('Book A', ['great ending'], ['Ending'], [('POSITIVE', 0.9)], save_folder)
+
+    # Delta mode takes the stored ids from the CSV, so it must hold every review written anywhere
+    assert _upgrade_review_csv(review_csv_path('Book A', save_folder)) == {review_id('great ending')}
+
+
+def test_rating_after_migration_changes_training_data(tmp_path, store, monkeypatch, rated_books):
+    import os
+    import pandas as pd
+    import book_store
+    import model_b
+
+    training_csv = tmp_path / 'all_books_scores.csv'
+    rated_books(6).to_csv(training_csv, index=False)
+    book_store.migrate_from_csv(store, training_csv=str(training_csv))
+    monkeypatch.setattr(model_b, 'TRAINING_CSV', str(training_csv))
+    assert len(model_b.load_training_data()) == 6
+
+    # Rated through the store
+    assert store.set_my_scores([('Book 0', 5), ('Unscored Book', -1)]) == ['Unscored Book']
+    training = model_b.load_training_data().set_index('Book Title')
+    assert training.loc['Book 0', 'My Score'] == 5
+    assert 'Unscored Book' not in training.index
+
+    # Rated by editing the CSV, as before the migration
+    df = rated_books(6)
+    df.loc[df['Book Title'] == 'Book 1', 'My Score'] = -5
+    pd.concat([df, rated_books(7).tail(1)]).to_csv(training_csv, index=False)
+    os.utime(training_csv, ns=(os.stat(training_csv).st_atime_ns, os.stat(training_csv).st_mtime_ns + 10**9))
+    training = model_b.load_training_data().set_index('Book Title')
+    assert training.loc['Book 1', 'My Score'] == -5
+    assert len(training) == 7
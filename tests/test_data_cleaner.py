@@ -0,0 +1,99 @@
+import os
+
+import pandas as pd
+
+import book_store
+import data_cleaner
+
+
+def write_reviews(folder, book_title, rows):
+    df = pd.DataFrame(rows, columns=['Review', 'Category', 'Sentiment', 'Confidence Score'])
+    path = os.path.join(folder, f"{book_title}_reviews_sentiment.csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_rerun_updates_changed_book(tmp_path, store):
+    reviews = tmp_path / 'reviews'
+    reviews.mkdir()
+    output_file = str(tmp_path / 'all_books.csv')
+    write_reviews(reviews, 'Book A', [('a', 'Ending', 'POSITIVE', 0.5), ('b', 'Journey', 'NEGATIVE', -0.2)])
+    write_reviews(reviews, 'Book B', [('c', 'Ending', 'NEGATIVE', -0.4)])
+
+    data_cleaner.process_all_books(str(reviews), output_file, 'Author', 'Genre')
+    first = pd.read_csv(output_file).set_index('Book Title')
+    assert first.loc['Book A', 'Ending Score'] == 5.0
+    assert first.loc['Book A', 'Journey Score'] == -2.0
+
+    # Change one book's reviews and run again; its existing row is updated in place
+    path = write_reviews(reviews, 'Book A', [('a', 'Ending', 'POSITIVE', 0.9)])
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    data_cleaner.process_all_books(str(reviews), output_file, 'Author', 'Genre')
+
+    second = pd.read_csv(output_file).set_index('Book Title')
+    assert len(second) == 2
+    assert second.loc['Book A', 'Ending Score'] == 9.0
+    assert second.loc['Book A', 'Journey Score'] == 0.0
+    assert second.loc['Book B', 'Ending Score'] == -4.0
+
+
+def test_new_output_file_uses_stored_scores(tmp_path, store, monkeypatch):
+    reviews = tmp_path / 'reviews'
+    reviews.mkdir()
+    write_reviews(reviews, 'Book A', [('a', 'Ending', 'POSITIVE', 0.5)])
+    write_reviews(reviews, 'Book B', [('b', 'Journey', 'NEGATIVE', -0.3)])
+    data_cleaner.process_all_books(str(reviews), str(tmp_path / 'first.csv'), 'Author', 'Genre')
+
+    # A new output file is built from the manifest without reading any review file
+    def fail(*args, **kwargs):
+        raise AssertionError("review files were read again")
+    import review_loader
+    monkeypatch.setattr(review_loader, 'load_review_files', fail)
+
+    data_cleaner.process_all_books(str(reviews), str(tmp_path / 'second.csv'), 'Author', 'Genre')
+    second = pd.read_csv(tmp_path / 'second.csv').set_index('Book Title')
+    assert second.loc['Book A', 'Ending Score'] == 5.0
+    assert second.loc['Book B', 'Journey Score'] == -3.0
+
+
+def test_skipped_file_is_not_read_again(tmp_path, store, capsys):
+    reviews = tmp_path / 'reviews'
+    reviews.mkdir()
+    output_file = str(tmp_path / 'all_books.csv')
+    write_reviews(reviews, 'Book A', [('a', 'Ending', 'POSITIVE', 0.5)])
+    pd.DataFrame({'Review': ['x']}).to_csv(reviews / 'Broken_reviews_sentiment.csv', index=False)
+
+    data_cleaner.process_all_books(str(reviews), output_file, 'Author', 'Genre')
+    assert 'Skipping' in capsys.readouterr().out
+
+    data_cleaner.process_all_books(str(reviews), output_file, 'Author', 'Genre')
+    assert 'up to date' in capsys.readouterr().out
+
+
+def test_store_keeps_author_and_genre(tmp_path, store):
+    reviews = tmp_path / 'reviews'
+    reviews.mkdir()
+    training_csv = tmp_path / 'all_books_scores.csv'
+    pd.DataFrame({
+        'Book Title': ['Book A', 'Book B'],
+        'Author': ['Tolkien', 'Austen'],
+        'Genre': ['Fantasy', 'Romance'],
+        'Ending Score': [5.0, -4.0],
+        'Journey Score': [0.0, 0.0],
+        'My Score': [4, -2],
+    }).to_csv(training_csv, index=False)
+    book_store.migrate_from_csv(store, training_csv=str(training_csv))
+    write_reviews(reviews, 'Book A', [('a', 'Ending', 'POSITIVE', 0.5)])
+    write_reviews(reviews, 'Book B', [('b', 'Ending', 'NEGATIVE', -0.4)])
+    write_reviews(reviews, 'Book C', [('c', 'Journey', 'POSITIVE', 0.1)])
+
+    output_file = str(tmp_path / 'Book C_processed.csv')
+    data_cleaner.process_all_books(str(reviews), output_file, 'King', 'Horror')
+
+    rated = store.rated_books_frame().set_index('Book Title')
+    assert rated.loc['Book A', 'Author'] == 'Tolkien'
+    assert rated.loc['Book B', 'Genre'] == 'Romance'
+    output = pd.read_csv(output_file).set_index('Book Title')
+    assert output.loc['Book A', 'Author'] == 'Tolkien'
+    assert output.loc['Book C', 'Author'] == 'King'
+    assert store.books_frame().set_index('Book Title').loc['Book C', 'Genre'] == 'Horror'
@@ -0,0 +1,39 @@
+import pandas as pd
+
+import model_b
+import model_store
+
+
+def test_update_model_keeps_classes_aligned(monkeypatch, rated_books):
+    training_df = rated_books(40)
+    artifact = model_b.train_model(training_df.iloc[:36])
+
+    # With a one-row sample, the fit only sees every score because the missing ones are added
+    monkeypatch.setattr(model_b, 'UPDATE_SAMPLE_ROWS', 1)
+    new_rows = training_df.iloc[36:]
+    new_rows = new_rows[new_rows['My Score'] == 4]
+    updated = model_b.update_model(artifact, training_df, new_rows)
+
+    model = updated['model']
+    assert list(model.classes_) == list(artifact['model'].classes_)
+    assert len(model.estimators_) == len(artifact['model'].estimators_) + model_b.UPDATE_TREES
+    assert all(tree.n_classes_ == len(model.classes_) for tree in model.estimators_)
+    assert set(model_b.predict_scores(training_df, updated)) <= {-3, 2, 4}
+    # The saved artifact's forest is left as it was
+    assert len(artifact['model'].estimators_) == len(model.estimators_) - model_b.UPDATE_TREES
+
+
+def test_update_model_needs_retrain_for_new_score(rated_books):
+    training_df = rated_books(40)
+    artifact = model_b.train_model(training_df.iloc[:36])
+    new_rows = training_df.iloc[36:].assign(**{'My Score': 5})
+    assert model_b.update_model(artifact, pd.concat([training_df.iloc[:36], new_rows]), new_rows) is None
+
+
+def test_small_libraries_are_retrained_in_full(monkeypatch, rated_books):
+    updates = []
+    monkeypatch.setattr(model_store, 'get_or_train', lambda *args, update=None, **kwargs: updates.append(update))
+
+    model_b.load_model(rated_books(model_b.INCREMENTAL_MIN_ROWS - 1))
+    model_b.load_model(rated_books(model_b.INCREMENTAL_MIN_ROWS))
+    assert updates == [None, model_b.update_model]
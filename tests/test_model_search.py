@@ -0,0 +1,26 @@
+import os
+
+from model_search import fold_splits, search
+
+
+def test_shuffled_rows_get_their_own_folds(tmp_path, rated_books):
+    books = rated_books(30)
+    shuffled = books.sample(frac=1, random_state=1).reset_index(drop=True)
+
+    folds = fold_splits(books, folds=3, folder=str(tmp_path))
+    shuffled_folds = fold_splits(shuffled, folds=3, folder=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
+
+    # Folds of the shuffled rows are computed for them, so they stay stratified by score
+    for _, test in shuffled_folds:
+        assert set(shuffled.iloc[test]['My Score'].value_counts()) <= {3, 4}
+
+    # Cached folds are reused for the same rows in the same order
+    cached = fold_splits(books, folds=3, folder=str(tmp_path))
+    assert all((a == b).all() for (a, _), (b, _) in zip(folds, cached))
+
+
+def test_search_reports_every_configuration(tmp_path, rated_books):
+    results = search(rated_books(30), {'n_estimators': [5, 10]}, folds=3, n_jobs=1, fold_folder=str(tmp_path))
+    assert len(results) == 2
+    assert {'accuracy', 'fit_seconds', 'predict_ms_per_book', 'params'} <= set(results.columns)
@@ -0,0 +1,19 @@
+import model_b
+import model_store
+
+
+def test_only_recent_versions_stay_loaded(tmp_path, monkeypatch, rated_books):
+    monkeypatch.setattr(model_store, '_loaded', model_store.OrderedDict())
+    folder = str(tmp_path / 'models')
+    columns = model_b.FEATURE_COLUMNS + [model_b.TARGET_COLUMN]
+
+    versions = []
+    for count in (20, 21, 22, 23):
+        artifact = model_store.get_or_train(rated_books(count), columns, model_b.train_model, folder=folder,
+                                            model_format=model_b.MODEL_FORMAT)
+        versions.append(artifact['version'])
+
+    assert [version for _, version in model_store._loaded] == versions[-model_store.LOADED_VERSIONS:]
+    # An evicted version is loaded from disk again
+    assert model_store.latest_artifact(folder)['version'] == versions[-1]
+    assert model_store._load_version(versions[0], folder)['version'] == versions[0]
@@ -0,0 +1,38 @@
+import os
+import functools
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import pytest
+
+from page_fetcher import fetch_page
+
+FIXTURE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    """Serves the saved Goodreads pages in tests/fixtures over local HTTP."""
+    handler = functools.partial(QuietHandler, directory=FIXTURE_FOLDER)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_page_with_reviews_is_fetched_over_http(fixture_server):
+    page = fetch_page(f"{fixture_server}/book_with_reviews.html", browser_fallback=False, snapshot=False)
+    assert page.source == 'http'
+    assert 'ReviewText__content' in page.html
+
+
+def test_page_without_reviews_raises_without_browser(fixture_server):
+    with pytest.raises(ValueError):
+        fetch_page(f"{fixture_server}/book_without_reviews.html", browser_fallback=False, snapshot=False)
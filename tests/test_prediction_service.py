@@ -0,0 +1,26 @@
+import pandas as pd
+
+import model_b
+import model_store
+from prediction_service import PredictionService
+
+
+def test_predict_picks_up_new_training_data(tmp_path, monkeypatch, rated_books):
+    training = {'df': rated_books(30)}
+    monkeypatch.setattr(model_b, 'load_training_data', lambda: training['df'])
+    monkeypatch.setattr(model_b, 'load_model', lambda training_df=None: model_store.get_or_train(
+        training_df, model_b.FEATURE_COLUMNS + [model_b.TARGET_COLUMN], model_b.train_model,
+        update=model_b.update_model, folder=str(tmp_path / 'models'), model_format=model_b.MODEL_FORMAT))
+
+    service = PredictionService()
+    try:
+        book = {'Book Title': 'New', 'Author': 'Author 1', 'Genre': 'Genre 0',
+                'Ending Score': 6.0, 'Journey Score': -4.0}
+        _, first_version = service.predict_books([book])
+
+        # Rating another book changes the model the service predicts with, without a reload
+        training['df'] = pd.concat([training['df'], rated_books(31).tail(1)], ignore_index=True)
+        _, second_version = service.predict_books([book])
+        assert second_version != first_version
+    finally:
+        service.close()
@@ -0,0 +1,33 @@
+import os
+
+import ScrapeSentiment_Function
+import prediction_service
+from snapshot_store import SnapshotStore, replay_books
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def test_rescore_bypasses_sentiment_cache(tmp_path, store, monkeypatch):
+    snapshots = SnapshotStore(str(tmp_path / 'snapshots'))
+    url = 'https://www.goodreads.com/book/show/1'
+    with open(os.path.join(FIXTURES, 'book_with_reviews.html'), encoding='utf-8') as file:
+        snapshots.save(url, file.read(), source='test')
+
+    calls = []
+
+    def analyze(contents, use_cache=True):
+        calls.append(use_cache)
+        return [('POSITIVE', 0.5)] * len(contents)
+
+    def service_client():
+        raise AssertionError("the prediction service was asked for cached scores")
+
+    monkeypatch.setattr(ScrapeSentiment_Function, 'analyze_sentiment_batch', analyze)
+    monkeypatch.setattr(prediction_service, 'get_service_client', service_client)
+    try:
+        results = replay_books([('Book A', url)], str(tmp_path / 'CSV'), store=snapshots, rescore=True)
+    finally:
+        snapshots.close()
+
+    assert results['Book A']['error'] is None
+    assert calls == [False]